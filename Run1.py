@@ -1,6 +1,5 @@
 print("hello you")
 import pandas as pd
-import matplotlib.pyplot as plt
 
 # Excel-Datei laden
 pfad = r"C:\Users\micha\Documents\Python\Datenfile\Daten_Simulationen.xlsx"
@@ -27,6 +26,8 @@ blockmittel = df.resample('1h').mean()
 gleitmittel = df.rolling(window=6).mean()
 
 # ---------- VERGLEICH GRAFISCH ----------
+import matplotlib.pyplot as plt  # erst hier laden – Berechnung oben braucht es nicht
+
 plt.figure(figsize=(12, 6))
 
 # Beispiel: Temperatur T-ABL vergleichen
@@ -1,7 +1,8 @@
 import streamlit as st
-import pandas as pd
 import os
+import uuid
 from foils import FOILS
+from progress_store import open_store
 
 # -------------------------------------------------
 # Config
@@ -24,6 +25,8 @@ WELLEN = ["Flachwasser", "Kleine Wellen", "Grosse Wellen", "nicht notwendig"]
 # Daten laden / erzeugen
 # -------------------------------------------------
 if not os.path.exists(FILE):
+    import pandas as pd
+
     rows = [
         (l, g, d, w, wa)
         for l in LEVELS
@@ -36,57 +39,46 @@ if not os.path.exists(FILE):
     for f in FOIL_NAMES:
         df[f] = pd.NA
     df.to_csv(FILE, index=False)
-else:
-    df = pd.read_csv(FILE)
 
-# -------------------------------------------------
-# Logik
-# -------------------------------------------------
-def row_done(row):
-    return (row[FOIL_NAMES].fillna(0) == 1).any()
-
-def get_last_4_context(df, current_row):
-    mask = (
-        (df["Level"] == current_row.Level) &
-        (df["Gewicht"] == current_row.Gewicht) &
-        (df["Disziplin"] == current_row.Disziplin)
-    )
-
-    subset = df[mask].copy()
-    subset = subset[subset.apply(row_done, axis=1)]
-
-    last = subset.tail(4)
-
-    result = []
-    for _, r in last.iterrows():
-        foil = None
-        for f in FOIL_NAMES:
-            if r[f] == 1:
-                foil = f
-                break
-        result.append({
-            "Wind": r["Wind"],
-            "Wellen": r["Wellen"],
-            "Foil": foil
-        })
-
-    return result[::-1]
+# Ein Store pro Prozess – alle Sessions teilen DataFrame und Bitmap
+# (Backend: SQLite mit Zeilen-Leases, FOILFINDER_STORE=journal für CSV + Journal)
+@st.cache_resource
+def get_store():
+    return open_store(FILE, FOIL_NAMES)
+
+store = get_store()
+store.refresh()
+df = store.df
+
+# Jede Session = ein Experte mit eigener reservierter Situation
+if "expert" not in st.session_state:
+    st.session_state.expert = uuid.uuid4().hex[:8]
 
 # -------------------------------------------------
 # Fortschritt
 # -------------------------------------------------
-open_rows = df[~df.apply(row_done, axis=1)]
-done = len(df) - len(open_rows)
+done = store.done_count
 
 st.title("Foilfinder – Experteneingabe")
 st.progress(done / len(df))
 st.caption(f"{done} / {len(df)} Situationen bewertet")
 
-if open_rows.empty:
-    st.success("🎉 Alle Situationen bewertet")
+# Hinweis aus dem letzten Durchlauf (z.B. Lease verloren)
+if "notice" in st.session_state:
+    st.warning(st.session_state.pop("notice"))
+
+# Beim Absenden wird die Situation gespeichert, die angezeigt war – claim() kann inzwischen
+# eine andere liefern, wenn die Lease abgelaufen ist
+shown = st.session_state.get("shown_idx")
+idx = store.claim(st.session_state.expert)
+st.session_state.shown_idx = idx
+if idx is None:
+    if done < len(df):
+        st.info("Alle offenen Situationen werden gerade von anderen Experten bewertet.")
+    else:
+        st.success("🎉 Alle Situationen bewertet")
     st.stop()
 
-idx = open_rows.index[0]
 row = df.loc[idx]
 
 # -------------------------------------------------
@@ -135,18 +127,19 @@ with center:
                 st.error("Ungültige Foil-Nummer.")
                 st.stop()
 
-        # Reset
-        for f in FOIL_NAMES:
-            df.at[idx, f] = pd.NA
-
-        # Setzen
+        # Setzen (Reset der übrigen Foils übernimmt der Store)
+        ranks = {}
         if selection[0] != 0:
             for i, num in enumerate(selection):
                 if num != 0:
-                    df.at[idx, FOILS[num]] = i + 1
+                    ranks[FOILS[num]] = i + 1
 
-        df.to_csv(FILE, index=False)
-        st.session_state.last_selection = selection
+        if store.save(idx if shown is None else shown, ranks, expert=st.session_state.expert):
+            st.session_state.last_selection = selection
+        else:
+            st.session_state.notice = ("⏱ Die Reservierung ist abgelaufen und die Situation wurde "
+                                       "von einem anderen Experten übernommen – nicht gespeichert. "
+                                       "Hier ist eine neue Situation.")
         st.rerun()
 
 # -------- Letzte 4 (Kontext) --------
@@ -154,7 +147,7 @@ with right:
     st.subheader("Letzte 4 – gleicher Kontext")
     st.caption("Level / Gewicht / Disziplin")
 
-    last4 = get_last_4_context(df, row)
+    last4 = store.last_context(idx)
 
     if not last4:
         st.caption("Noch keine Einträge")
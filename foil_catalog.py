@@ -0,0 +1,183 @@
+# foil_catalog.py
+# Foil-Katalog – einzige Quelle für Namen, IDs, Größen, Specs und Eigenschaften
+#
+# foils.FOILS, foil_specs.FOIL_SPECS, die Größenlisten in parawing_engine /
+# foilfinder_generate_matrix und FOIL_PROPERTIES werden alle hieraus abgeleitet.
+#
+# - Foil / Family: Records mit __slots__, feste Integer-IDs (Foil-ID = Nummer in foils.FOILS)
+# - Namen + Aliasse ("Flow 720" = "Flow Ace 720") → ID über einen Index,
+#   Gross/Klein und Leerzeichen egal
+# - Zahlen liegen zusätzlich als read-only NumPy-Arrays vor, Index = ID
+#   (Zeile 0 = "nicht relevant", leer)
+
+from types import MappingProxyType
+
+import numpy as np
+
+# =========================================================
+# DATEN
+# =========================================================
+SPEC_KEYS = ["Span (mm)", "Chord (mm)", "Fläche (cm²)", "Volumen (cm³)", "AR", "Profil-Dicke (mm)"]
+
+PERFORMANCE_PARAMS = ["Speed", "Lift", "Glide", "Maneuverability", "Pump", "Ease of use"]
+
+# Familie, Name in den Matrix-CSVs (progress.csv, foilfinder_parawing.csv),
+# Eigenschaften in PERFORMANCE_PARAMS-Reihenfolge (Scoring in parawing_engine)
+FAMILY_DATA = [
+    ("Infinity Ace", "Infinity Ace", (4.5, 3.5, 3.5, 5.0, 3.5, 4.5)),
+    ("Stride Ace",   "Stride Ace",   (3.0, 4.5, 4.0, 3.5, 5.0, 4.0)),
+    ("Stride",       "Stride",       (3.0, 5.0, 4.0, 3.5, 5.0, 4.0)),
+    ("Pacer",        "Pacer",        (3.5, 4.5, 3.5, 4.5, 3.0, 5.0)),
+    ("Flow Ace",     "Flow",         (4.0, 4.0, 5.0, 4.0, 4.0, 3.5)),
+]
+
+# Familie, Größe, Specs in SPEC_KEYS-Reihenfolge – Zeilenreihenfolge = Foil-ID 1..n
+FOIL_DATA = [
+    ("Infinity Ace",  540, (635, 110, 540, 340, 7.5, 11.5)),
+    ("Infinity Ace",  690, (720, 125, 690, 495, 7.5, 12.5)),
+    ("Infinity Ace",  840, (795, 135, 840, 666, 7.5, 14.0)),
+    ("Infinity Ace",  990, (860, 145, 990, 855, 7.5, 15.0)),
+    ("Infinity Ace", 1140, (925, 155, 1140, 1065, 7.5, 15.5)),
+    ("Infinity Ace", 1390, (1020, 170, 1390, 1420, 7.5, 17.0)),
+    ("Stride Ace",   1360, (1100, 169, 1362, 1500, 8.9, 19.7)),
+    ("Stride Ace",   1740, (1260, 176, 1737, 2291, 9.14, 22.4)),
+    ("Stride",       2050, (1400, 177, 2047, 2897, 9.5, 24.3)),
+    ("Pacer",         950, (754, 160, 950, 830, 6.0, 17.5)),
+    ("Pacer",        1250, (864, 180, 1250, 1210, 6.0, 19.5)),
+    ("Pacer",        1550, (964, 200, 1550, 1650, 6.0, 21.5)),
+    ("Pacer",        1850, (1054, 220, 1850, 2140, 6.0, 23.5)),
+    ("Pacer",        2200, (1094, 250, 2195, 3340, 5.45, 27.6)),
+    ("Flow Ace",      720, (827, 121, 720, 437, 9.5, 11.1)),
+    ("Flow Ace",      900, (925, 135, 900, 612, 9.5, 12.5)),
+    ("Flow Ace",     1080, (1013, 148, 1080, 804, 9.5, 13.7)),
+    ("Flow Ace",     1260, (1094, 160, 1260, 1013, 9.5, 14.8)),
+]
+
+# =========================================================
+# RECORDS
+# =========================================================
+class Family:
+    __slots__ = ("id", "name", "csv_name", "properties", "sizes", "foil_ids")
+
+    def __init__(self, id, name, csv_name, properties):
+        self.id = id
+        self.name = name
+        self.csv_name = csv_name
+        self.properties = MappingProxyType(dict(zip(PERFORMANCE_PARAMS, properties)))
+        self.sizes = None     # read-only int-Array, aufsteigend
+        self.foil_ids = None  # Foil-IDs in derselben Reihenfolge wie sizes
+
+    def __repr__(self):
+        return f"Family({self.id}, {self.name!r})"
+
+
+class Foil:
+    __slots__ = ("id", "family", "size", "name", "csv_name", "spec_values")
+
+    def __init__(self, id, family, size, spec_values):
+        self.id = id
+        self.family = family
+        self.size = size
+        self.name = f"{family.name} {size}"
+        self.csv_name = f"{family.csv_name} {size}"
+        self.spec_values = tuple(spec_values)
+
+    @property
+    def specs(self):
+        """Specs als dict mit den Original-Schlüsseln (wie foil_specs.FOIL_SPECS)"""
+        return dict(zip(SPEC_KEYS, self.spec_values))
+
+    def __repr__(self):
+        return f"Foil({self.id}, {self.name!r})"
+
+
+def normalize(name):
+    """Schlüssel für den Namens-Index: Leerzeichen zusammenfassen, casefold"""
+    return " ".join(str(name).split()).casefold()
+
+
+def _readonly(arr):
+    arr.flags.writeable = False
+    return arr
+
+# =========================================================
+# KATALOG
+# =========================================================
+FAMILIES = tuple(Family(i, *row) for i, row in enumerate(FAMILY_DATA))
+FAMILY_BY_NAME = {f.name: f for f in FAMILIES}
+
+FOIL_RECORDS = tuple(
+    Foil(i + 1, FAMILY_BY_NAME[fam], size, specs)
+    for i, (fam, size, specs) in enumerate(FOIL_DATA)
+)
+FOIL_NAMES = tuple(f.name for f in FOIL_RECORDS)
+
+for _fam in FAMILIES:
+    _members = sorted((f for f in FOIL_RECORDS if f.family is _fam), key=lambda f: f.size)
+    _fam.sizes = _readonly(np.array([f.size for f in _members], dtype=np.int64))
+    _fam.foil_ids = _readonly(np.array([f.id for f in _members], dtype=np.int64))
+
+# Name / Alias (normalisiert) → ID
+_FAMILY_INDEX = {}
+for _fam in FAMILIES:
+    for _alias in {_fam.name, _fam.csv_name}:
+        _FAMILY_INDEX[normalize(_alias)] = _fam.id
+
+_NAME_INDEX = {}
+for _foil in FOIL_RECORDS:
+    for _alias in {_foil.family.name, _foil.family.csv_name}:
+        _NAME_INDEX[normalize(f"{_alias} {_foil.size}")] = _foil.id
+
+# Arrays, Index = Foil-ID (Zeile 0 leer)
+FOIL_FAMILY = _readonly(np.array([-1] + [f.family.id for f in FOIL_RECORDS], dtype=np.int64))
+FOIL_SIZE = _readonly(np.array([0] + [f.size for f in FOIL_RECORDS], dtype=np.int64))
+SPEC_MATRIX = _readonly(np.array(
+    [[np.nan] * len(SPEC_KEYS)] + [f.spec_values for f in FOIL_RECORDS], dtype=float
+))
+# Index = Familien-ID
+FAMILY_PROPERTIES = _readonly(np.array(
+    [[f.properties[p] for p in PERFORMANCE_PARAMS] for f in FAMILIES], dtype=float
+))
+
+# =========================================================
+# LOOKUP
+# =========================================================
+def foil_id(name):
+    """ID zu Name oder Alias, None wenn unbekannt"""
+    return _NAME_INDEX.get(normalize(name))
+
+
+def get_foil(key):
+    """Foil-Record zu ID, Name oder Alias (None wenn unbekannt)"""
+    if isinstance(key, (int, np.integer)):
+        return FOIL_RECORDS[key - 1] if 1 <= key <= len(FOIL_RECORDS) else None
+    fid = foil_id(key)
+    return None if fid is None else FOIL_RECORDS[fid - 1]
+
+
+def get_family(name):
+    fid = _FAMILY_INDEX.get(normalize(name))
+    return None if fid is None else FAMILIES[fid]
+
+
+def family_sizes(name):
+    """Aufsteigend sortierte Größen einer Familie (read-only int-Array)"""
+    return get_family(name).sizes
+
+
+def foil_specs(name):
+    """Specs-dict zu Name oder Alias, None wenn unbekannt"""
+    foil = get_foil(name)
+    return None if foil is None else foil.specs
+
+
+def foil_ids(names):
+    """IDs für viele Namen auf einmal (0 = unbekannt)"""
+    return np.array([_NAME_INDEX.get(normalize(n), 0) for n in names], dtype=np.int64)
+
+
+if __name__ == "__main__":
+    for fam in FAMILIES:
+        aliases = "" if fam.csv_name == fam.name else f"  (CSV: {fam.csv_name})"
+        print(f"{fam.name:<14} {fam.sizes.tolist()}{aliases}")
+    print(f"{len(FOIL_RECORDS)} Foils, {len(_NAME_INDEX)} Namen/Aliasse")
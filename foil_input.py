@@ -3,6 +3,7 @@
 import pandas as pd
 import os
 from foils import FOILS
+from progress_store import open_store
 
 # -----------------------------
 # Parameter
@@ -16,7 +17,7 @@ WELLEN = ["Flachwasser", "Kleine Wellen", "Grosse Wellen", "nicht notwendig"]
 
 FILE = "progress.csv"
 
-FOIL_NAMES = list(FOILS.values())
+FOIL_NAMES = [v for k, v in FOILS.items() if k != 0]  # ohne "nicht relevant" (wie app.py)
 
 # -----------------------------
 # Alle Kombinationen erzeugen
@@ -35,57 +36,39 @@ columns = ["Level", "Gewicht", "Disziplin", "Wind", "Wellen"] + FOIL_NAMES
 # -----------------------------
 # CSV laden oder erzeugen
 # -----------------------------
-if os.path.exists(FILE):
-    df = pd.read_csv(FILE)
-else:
+if not os.path.exists(FILE):
     df = pd.DataFrame(all_rows, columns=columns[:5])
     for f in FOIL_NAMES:
-        df[f] = ""
+        df[f] = pd.NA
     df.to_csv(FILE, index=False)
 
-# -----------------------------
-# Hilfsfunktionen
-# -----------------------------
-def row_done(row):
-    return (row[FOIL_NAMES] == "1").any()
-
-def similar_rows(df, row):
-    return df[
-        (df.Level == row.Level) &
-        (df.Gewicht == row.Gewicht) &
-        (df.Disziplin == row.Disziplin)
-    ]
-
-def most_common_top1(similar):
-    tops = []
-    for _, r in similar.iterrows():
-        for f in FOIL_NAMES:
-            if r[f] == "1":
-                tops.append(f)
-    if tops:
-        return max(set(tops), key=tops.count)
-    return None
+# gleicher Store wie app.py – parallel laufende Experten bekommen verschiedene Situationen
+store = open_store(FILE, FOIL_NAMES)
+df = store.df
+EXPERT = f"cli-{os.getpid()}"
 
 # -----------------------------
 # Haupt-Loop
 # -----------------------------
 last_selection = None
 
-for idx, row in df.iterrows():
-    if not row_done(row):
+idx = store.claim(EXPERT)
+if idx is not None:
+    row = df.loc[idx]
 
-        print("\n" + "-" * 50)
-        print(f"Situation {idx + 1} / {len(df)}")
-        print(f"Level     : {row.Level}")
-        print(f"Gewicht   : {row.Gewicht}")
-        print(f"Disziplin : {row.Disziplin}")
-        print(f"Wind      : {row.Wind}")
-        print(f"Wellen    : {row.Wellen}")
+    print("\n" + "-" * 50)
+    print(f"Situation {idx + 1} / {len(df)}")
+    print(f"Level     : {row.Level}")
+    print(f"Gewicht   : {row.Gewicht}")
+    print(f"Disziplin : {row.Disziplin}")
+    print(f"Wind      : {row.Wind}")
+    print(f"Wellen    : {row.Wellen}")
 
-        print("\nFoils:")
-        for k, v in FOILS.items():
-            print(f"{k:>2}: {v}")
+    print("\nFoils:")
+    for k, v in FOILS.items():
+        print(f"{k:>2}: {v}")
 
+    while True:
         inp = input(
             "\nFoils eingeben (z.B. 14 13 9 | Enter = gleich wie vorher): "
         ).strip()
@@ -101,11 +84,14 @@ for idx, row in df.iterrows():
             except ValueError:
                 print("❌ Ungültige Eingabe.")
                 continue
+            if any(n not in FOILS for n in selection):
+                print("❌ Ungültige Foil-Nummer.")
+                continue
 
         top1_foil = FOILS[selection[0]]
 
-        # Konsistenz-Warnung
-        expected = most_common_top1(similar_rows(df, row))
+        # Konsistenz-Warnung (häufigste Top-1 bei gleichem Level / Gewicht / Disziplin)
+        expected = store.modal_top1(idx)
         if expected and expected != top1_foil:
             print("\n⚠️ Konsistenz-Hinweis:")
             print(f"   Häufige Top-1 bisher: {expected}")
@@ -114,20 +100,25 @@ for idx, row in df.iterrows():
             if confirm.lower() == "x":
                 continue
 
-        # Werte setzen
-        for f in FOIL_NAMES:
-            df.at[idx, f] = ""
+        break
 
+    # Werte setzen (0 = nicht relevant)
+    ranks = {}
+    if selection[0] != 0:
         for i, num in enumerate(selection):
-            df.at[idx, FOILS[num]] = str(i + 1)
+            if num != 0:
+                ranks[FOILS[num]] = i + 1
 
-        df.to_csv(FILE, index=False)
+    if store.save(idx, ranks, expert=EXPERT):
         last_selection = selection
+        print(f"✔ gespeichert ({store.done_count} / {len(df)})")
+    else:
+        store.release(EXPERT)
+        print("❌ Reservierung abgelaufen – die Situation wurde inzwischen von einem anderen "
+              "Experten übernommen, nicht gespeichert. Neu starten für die nächste Situation.")
 
-        done = sum(df.apply(row_done, axis=1))
-        print(f"✔ gespeichert ({done} / {len(df)})")
-
-        break
+elif store.done_count < len(df):
+    print("\nAlle offenen Situationen werden gerade von anderen Experten bewertet.")
 
 else:
-    print("\n🎉 Alle 1008 Situationen sind bewertet!")
+    print(f"\n🎉 Alle {len(df)} Situationen sind bewertet!")
@@ -0,0 +1,141 @@
+# foil_sizing.py
+# Größenwahl über den Katalog (foil_catalog) per Binärsuche
+#
+# Gewicht wird nicht mehr in Buckets gepresst: aus kg (kontinuierlich) wird eine
+# Zielfläche in cm² interpoliert, dann wird pro Familie per bisect die nächste
+# Größe gesucht. Offsets (Level, Wind, ...) sind wie in den Regeln Größenschritte.
+#
+# Kalibrierung: die Bucket-Mitten treffen die Regeln exakt –
+#   60 kg → eine Größe kleiner, 80 kg → Referenz, 100 kg → eine Größe grösser
+# und die Bucket-Grenzen 70 / 90 kg liegen genau zwischen zwei Größen.
+
+import bisect
+
+from foil_catalog import FAMILIES, Family, get_family
+
+REFERENCE_KG = 80.0  # Mitte von "70-90"
+KG_PER_STEP = 20.0   # Bucket-Breite = eine Größe
+
+# Familien-ID → Größen als Tuple (bisect auf Python-Sequenzen ist schneller als auf Arrays)
+_SIZES = {fam.id: tuple(fam.sizes.tolist()) for fam in FAMILIES}
+
+
+def _family(family):
+    fam = family if isinstance(family, Family) else get_family(family)
+    if fam is None:
+        raise KeyError(f"Unbekannte Foil-Familie: {family}")
+    return fam
+
+
+def family_size_list(family):
+    return _SIZES[_family(family).id]
+
+
+def size_index(family, size):
+    """Index einer Größe in der Familie (wie list.index, aber per bisect)"""
+    sizes = family_size_list(family)
+    i = bisect.bisect_left(sizes, size)
+    if i == len(sizes) or sizes[i] != size:
+        raise ValueError(f"{size} ist keine Größe von {_family(family).name}")
+    return i
+
+
+def weight_steps(kg):
+    """Gewicht → Größenschritte relativ zu REFERENCE_KG (kontinuierlich)"""
+    return (float(kg) - REFERENCE_KG) / KG_PER_STEP
+
+
+# =========================================================
+# ZIELFLÄCHE
+# =========================================================
+def area_at(family, position):
+    """
+    Fläche an einer gebrochenen Index-Position (linear zwischen zwei Größen, an den Enden geklemmt).
+    Skalar in reinem Python – gleiche Werte wie np.interp, ohne dessen Aufruf-Overhead pro Regel.
+    """
+    sizes = family_size_list(family)
+    if position <= 0:
+        return float(sizes[0])
+    if position >= len(sizes) - 1:
+        return float(sizes[-1])
+    i = int(position)
+    return float(sizes[i] + (sizes[i + 1] - sizes[i]) * (position - i))
+
+
+def target_area(family, kg, reference_size, steps=0.0):
+    """Zielfläche (cm²): Referenzgröße + Gewicht + weitere Offsets in Größenschritten"""
+    return area_at(family, size_index(family, reference_size) + weight_steps(kg) + steps)
+
+
+# =========================================================
+# NÄCHSTE GRÖSSE
+# =========================================================
+def nearest_index(family, area):
+    """Index der nächsten Größe; bei Gleichstand die grössere (mehr Lift)"""
+    sizes = family_size_list(family)
+    i = bisect.bisect_left(sizes, area)
+    if i == 0:
+        return 0
+    if i == len(sizes):
+        return len(sizes) - 1
+    return i if sizes[i] - area <= area - sizes[i - 1] else i - 1
+
+
+def nearest_size(family, area):
+    return family_size_list(family)[nearest_index(family, area)]
+
+
+def nearest_sizes(family, area, n=2, smaller_first=True):
+    """
+    nearest_size plus die n-1 Größen daneben: zuerst die Größe auf der Seite der Zielfläche
+    (die beiden Größen, zwischen denen sie liegt), dann abwechselnd weiter nach aussen.
+    Liegt die Fläche genau auf einer Größe (Bucket-Regeln), bestimmt smaller_first die Seite.
+    """
+    sizes = family_size_list(family)
+    i = nearest_index(family, area)
+    if area != sizes[i]:
+        side = 1 if area > sizes[i] else -1
+    else:
+        side = -1 if smaller_first else 1
+    result = [sizes[i]]
+    for step in range(1, len(sizes)):
+        for j in (i + side * step, i - side * step):
+            if 0 <= j < len(sizes) and len(result) < n:
+                result.append(sizes[j])
+    return result
+
+
+def size_at_position(family, position):
+    """Größe an einer (gebrochenen) Index-Position; ganze Positionen = geklemmter Index"""
+    return nearest_size(family, area_at(family, position))
+
+
+def sizes_at_position(family, position, n=2, smaller_first=True):
+    """Größe an einer (gebrochenen) Position plus Alternativen (siehe nearest_sizes)"""
+    return nearest_sizes(family, area_at(family, position), n, smaller_first)
+
+
+def size_for_weight(family, kg, reference_size, steps=0.0):
+    return nearest_size(family, target_area(family, kg, reference_size, steps))
+
+
+if __name__ == "__main__":
+    # Bucket-Mitten müssen die Regel-Offsets (-1 / 0 / +1) treffen
+    errors = 0
+    for fam in FAMILIES:
+        sizes = family_size_list(fam)
+        for ref in sizes:
+            for kg, offset in [(60, -1), (80, 0), (100, 1)]:
+                expected = sizes[max(0, min(size_index(fam, ref) + offset, len(sizes) - 1))]
+                if size_for_weight(fam, kg, ref) != expected:
+                    errors += 1
+                    print(f"❌ {fam.name} {ref} @ {kg} kg")
+
+    print(f"{'kg':>5}  {'Flow Ace (ref 1080)':>20}  {'Pacer (ref 1250)':>17}  {'Infinity Ace (ref 990)':>23}")
+    for kg in range(50, 121, 5):
+        row = [
+            (target_area(name, kg, ref), size_for_weight(name, kg, ref))
+            for name, ref in [("Flow Ace", 1080), ("Pacer", 1250), ("Infinity Ace", 990)]
+        ]
+        print(f"{kg:>5}  " + "  ".join(f"{a:>11.0f} → {s:>4}" for a, s in row))
+    print(f"Abweichungen zu den Bucket-Regeln: {errors}")
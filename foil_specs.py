@@ -1,165 +1,7 @@
 # foil_specs.py
 # Foil-Namen EXAKT identisch zu CSV / App / Buttons
+# Abgeleitet aus foil_catalog – Lookups mit Aliassen ("Flow 720") über foil_catalog.foil_specs()
 
-FOIL_SPECS = {
+from foil_catalog import FOIL_RECORDS
 
-    # ------------------------
-    # INFINITY ACE
-    # ------------------------
-    "Infinity Ace 540": {
-        "Span (mm)": 635,
-        "Chord (mm)": 110,
-        "Fläche (cm²)": 540,
-        "Volumen (cm³)": 340,
-        "AR": 7.5,
-        "Profil-Dicke (mm)": 11.5,
-    },
-    "Infinity Ace 690": {
-        "Span (mm)": 720,
-        "Chord (mm)": 125,
-        "Fläche (cm²)": 690,
-        "Volumen (cm³)": 495,
-        "AR": 7.5,
-        "Profil-Dicke (mm)": 12.5,
-    },
-    "Infinity Ace 840": {
-        "Span (mm)": 795,
-        "Chord (mm)": 135,
-        "Fläche (cm²)": 840,
-        "Volumen (cm³)": 666,
-        "AR": 7.5,
-        "Profil-Dicke (mm)": 14.0,
-    },
-    "Infinity Ace 990": {
-        "Span (mm)": 860,
-        "Chord (mm)": 145,
-        "Fläche (cm²)": 990,
-        "Volumen (cm³)": 855,
-        "AR": 7.5,
-        "Profil-Dicke (mm)": 15.0,
-    },
-    "Infinity Ace 1140": {
-        "Span (mm)": 925,
-        "Chord (mm)": 155,
-        "Fläche (cm²)": 1140,
-        "Volumen (cm³)": 1065,
-        "AR": 7.5,
-        "Profil-Dicke (mm)": 15.5,
-    },
-    "Infinity Ace 1390": {
-        "Span (mm)": 1020,
-        "Chord (mm)": 170,
-        "Fläche (cm²)": 1390,
-        "Volumen (cm³)": 1420,
-        "AR": 7.5,
-        "Profil-Dicke (mm)": 17.0,
-    },
-
-    # ------------------------
-    # STRIDE
-    # ------------------------
-    "Stride Ace 1360": {
-        "Span (mm)": 1100,
-        "Chord (mm)": 169,
-        "Fläche (cm²)": 1362,
-        "Volumen (cm³)": 1500,
-        "AR": 8.9,
-        "Profil-Dicke (mm)": 19.7,
-    },
-    "Stride Ace 1740": {
-        "Span (mm)": 1260,
-        "Chord (mm)": 176,
-        "Fläche (cm²)": 1737,
-        "Volumen (cm³)": 2291,
-        "AR": 9.14,
-        "Profil-Dicke (mm)": 22.4,
-    },
-    "Stride 2050": {
-        "Span (mm)": 1400,
-        "Chord (mm)": 177,
-        "Fläche (cm²)": 2047,
-        "Volumen (cm³)": 2897,
-        "AR": 9.5,
-        "Profil-Dicke (mm)": 24.3,
-    },
-
-    # ------------------------
-    # PACER
-    # ------------------------
-    "Pacer 950": {
-        "Span (mm)": 754,
-        "Chord (mm)": 160,
-        "Fläche (cm²)": 950,
-        "Volumen (cm³)": 830,
-        "AR": 6.0,
-        "Profil-Dicke (mm)": 17.5,
-    },
-    "Pacer 1250": {
-        "Span (mm)": 864,
-        "Chord (mm)": 180,
-        "Fläche (cm²)": 1250,
-        "Volumen (cm³)": 1210,
-        "AR": 6.0,
-        "Profil-Dicke (mm)": 19.5,
-    },
-    "Pacer 1550": {
-        "Span (mm)": 964,
-        "Chord (mm)": 200,
-        "Fläche (cm²)": 1550,
-        "Volumen (cm³)": 1650,
-        "AR": 6.0,
-        "Profil-Dicke (mm)": 21.5,
-    },
-    "Pacer 1850": {
-        "Span (mm)": 1054,
-        "Chord (mm)": 220,
-        "Fläche (cm²)": 1850,
-        "Volumen (cm³)": 2140,
-        "AR": 6.0,
-        "Profil-Dicke (mm)": 23.5,
-    },
-    "Pacer 2200": {
-        "Span (mm)": 1094,
-        "Chord (mm)": 250,
-        "Fläche (cm²)": 2195,
-        "Volumen (cm³)": 3340,
-        "AR": 5.45,
-        "Profil-Dicke (mm)": 27.6,
-    },
-
-    # ------------------------
-    # FLOW ACE (JETZT KORREKT)
-    # ------------------------
-    "Flow Ace 720": {
-        "Span (mm)": 827,
-        "Chord (mm)": 121,
-        "Fläche (cm²)": 720,
-        "Volumen (cm³)": 437,
-        "AR": 9.5,
-        "Profil-Dicke (mm)": 11.1,
-    },
-    "Flow Ace 900": {
-        "Span (mm)": 925,
-        "Chord (mm)": 135,
-        "Fläche (cm²)": 900,
-        "Volumen (cm³)": 612,
-        "AR": 9.5,
-        "Profil-Dicke (mm)": 12.5,
-    },
-    "Flow Ace 1080": {
-        "Span (mm)": 1013,
-        "Chord (mm)": 148,
-        "Fläche (cm²)": 1080,
-        "Volumen (cm³)": 804,
-        "AR": 9.5,
-        "Profil-Dicke (mm)": 13.7,
-    },
-    "Flow Ace 1260": {
-        "Span (mm)": 1094,
-        "Chord (mm)": 160,
-        "Fläche (cm²)": 1260,
-        "Volumen (cm³)": 1013,
-        "AR": 9.5,
-        "Profil-Dicke (mm)": 14.8,
-    },
-}
+FOIL_SPECS = {foil.name: foil.specs for foil in FOIL_RECORDS}
@@ -0,0 +1,111 @@
+# foilfinder_api.py
+# JSON-HTTP-Service für Shop-Website und Kasse (FastAPI, wie familien-dashboard/backend)
+#
+#   GET  /recommend             ein Profil als Query-Parameter
+#                               foilfinder: ?Disziplin=Wingfoil&Level=...&Gewicht=...&Kategorie=...&Wind=...&Wellen=...
+#                               parawing:   ?engine=parawing&discipline=...&level=...&kg=80&wind=Light
+#                                           [&category=...&waves=...&weights=0,0,5,0,0,0&continuous=1&knots=18]
+#   POST /recommend/batch       {"profiles": [{...}, ...]} → {"results": [...]} (gleiche Felder wie oben)
+#   GET  /foils/{name}/specs    Specs aus foil_catalog (Name oder Alias, z.B. "Flow 1080")
+#
+# Antworten kommen als fertige JSON-Bytes aus recommend_service.py (vorkompilierte
+# Tabellen, keine CSV pro Anfrage). GET-Antworten tragen ETag + Cache-Control und
+# beantworten If-None-Match mit 304.
+#
+# Start:  uvicorn foilfinder_api:app --port 8001
+# Abhängigkeiten: requirements-api.txt
+
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, List
+
+from fastapi import Body, FastAPI, HTTPException, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
+
+import recommend_service as service
+
+# Empfehlungen ändern sich nur mit CSV / Regeln → kurz cachen, Specs praktisch nie
+CACHE_RECOMMEND = "public, max-age=300"
+CACHE_SPECS = "public, max-age=86400"
+CACHE_BATCH = "no-cache"
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # CSV-Matrix vor der ersten Anfrage kompilieren
+    logger.info("%d Foilfinder-Profile vorkompiliert", service.warm())
+    yield
+
+
+app = FastAPI(
+    title="Foilfinder API",
+    version="1.0",
+    description="Foil-Empfehlungen (Foilfinder-Matrix + Parawing/Wingfoil-Regeln) und Foil-Specs",
+    lifespan=lifespan,
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=False,
+    allow_methods=["GET", "POST"],
+    allow_headers=["*"],
+    expose_headers=["ETag"],
+)
+
+
+def not_modified(request, etag):
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def json_response(request, answer, cache_control):
+    etag, body = answer
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def lookup(fn, *args):
+    """Service-Fehler → HTTP-Status"""
+    try:
+        return fn(*args)
+    except (ValueError, ArithmeticError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+
+
+@app.get("/recommend", tags=["Empfehlung"])
+async def recommend(request: Request):
+    """Top 3 für ein Profil (Felder je nach engine, siehe Modulkopf)"""
+    params = dict(request.query_params)
+    return json_response(request, lookup(service.answer, params), CACHE_RECOMMEND)
+
+
+@app.post("/recommend/batch", tags=["Empfehlung"])
+async def recommend_batch(request: Request, profiles: List[Any] = Body(..., embed=True)):
+    """Viele Profile auf einmal; Fehler pro Profil als {"status", "detail"} (auch Einträge, die kein Objekt sind)"""
+    return json_response(request, service.batch_answer(profiles), CACHE_BATCH)
+
+
+@app.get("/foils/{name}/specs", tags=["Foils"])
+async def foil_specs(request: Request, name: str):
+    return json_response(request, lookup(service.specs_answer, name), CACHE_SPECS)
+
+
+@app.get("/", tags=["Health"])
+def health_check():
+    return {
+        "status": "ok",
+        "app": "Foilfinder API",
+        "rule_version": service.RULE_VERSION,
+        "foilfinder_profiles": len(service.foilfinder_answers()),
+    }
@@ -1,6 +1,17 @@
 import streamlit as st
-import pandas as pd
-from foil_specs import FOIL_SPECS
+from foil_catalog import foil_specs
+from foilfinder_data import column_values, derived, file_version
+from foilfinder_engine import (
+    DISZIPLIN_LABELS,
+    KATEGORIE_LABELS,
+    META_COLS,
+    WIND_IRRELEVANT,
+    build_index,
+    input_options,
+    profile_key,
+    recommend,
+)
+from result_cache import cache_stats, get_cache
 
 # =========================================================
 # CONFIG
@@ -9,42 +20,42 @@ st.set_page_config(page_title="Foilfinder", layout="wide")
 DATA_FILE = "foilfinder_functional_fixed.csv"
 
 # =========================================================
-# LOAD DATA
+# REGELN
 # =========================================================
-df = pd.read_csv(DATA_FILE)
+def build_tables(df):
+    values = column_values(df, META_COLS)
+    options = input_options(values)   # Kategorien / Wellen pro Disziplin
 
-META_COLS = ["Disziplin", "Level", "Gewicht", "Kategorie", "Wind", "Wellen"]
-FOIL_NAMES = [c for c in df.columns if c not in META_COLS]
+    return {
+        "index": build_index(df),
+        "values": values,
+        "kategorien": options["kategorien"],
+        "wellen": options["wellen"],
+    }
 
 # =========================================================
-# REGELN
+# LOAD DATA (einmal pro Prozess, neu bei Dateiänderung)
 # =========================================================
-# Disziplinen ohne Wind
-WIND_IRRELEVANT = ["Pronefoil", "Pumpfoil", "Downwind"]  # Downwind = SUP-Foiling
+TABLES = derived(DATA_FILE, build_tables)
+INDEX = TABLES["index"]
+ALL_KATS = TABLES["values"]["Kategorie"]
+KATEGORIEN_PRO_DISZIPLIN = TABLES["kategorien"]
+WELLEN_PRO_DISZIPLIN = TABLES["wellen"]
 
-# Kategorien
-ALL_KATS = list(df["Kategorie"].unique())
+# Ergebnisse prozessweit (alle Sessions), geleert sobald sich die CSV ändert
+RESULTS = get_cache("foilfinder", maxsize=2048)
 
-KATEGORIEN_PRO_DISZIPLIN = {
-    "Downwind": [k for k in ALL_KATS if k not in ["Jumping", "Lightwindfoil"]],
-    "Pumpfoil": [],
-    "Pronefoil": [],               # Kategorie ignoriert
-    "Wingfoil": ALL_KATS,
-    "Parawing": ALL_KATS,
-}
+def cached_recommend(user):
+    return RESULTS.get(profile_key(user), file_version(DATA_FILE), lambda: recommend(INDEX, user))
 
-# Wellen-Regeln
-ALL_WELLEN = list(df["Wellen"].unique())
-WELLEN_PRO_DISZIPLIN = {
-    "Pronefoil": [w for w in ALL_WELLEN if w != "Flachwasser"]
-}
+def top_foils(result, n=3):
+    """recommend liefert (Foils, Scores) nach Score absteigend"""
+    foils, _scores = result
+    return foils[:n]
 
 # =========================================================
-# UI LABEL MAPPINGS
+# UI LABEL MAPPINGS (DISZIPLIN_LABELS / KATEGORIE_LABELS aus foilfinder_engine)
 # =========================================================
-DISZIPLIN_LABELS = {"Downwind": "SUP-Foiling"}
-KATEGORIE_LABELS = {"Downwind": "SUP-Foiling"}
-
 def display_disziplin(d):
     return DISZIPLIN_LABELS.get(d, d)
 
@@ -70,57 +81,17 @@ for k in ["result_a", "result_b", "selected_foil"]:
 def fmt(v):
     return int(v) if float(v).is_integer() else round(v, 1)
 
-# =========================================================
-# RECOMMENDATION LOGIC
-# =========================================================
-def recommend(df, user):
-    # --- Basisfilter ---
-    base = df[
-        (df["Disziplin"] == user["Disziplin"]) &
-        (df["Level"] == user["Level"]) &
-        (df["Gewicht"] == user["Gewicht"])
-    ]
-
-    # Kategorie nur filtern, wenn relevant
-    if user["Disziplin"] not in ["Pronefoil", "Pumpfoil"]:
-        base = base[base["Kategorie"] == user["Kategorie"]]
-
-    if base.empty:
-        return None
-
-    scores = {f: 0 for f in FOIL_NAMES}
-
-    for _, r in base.iterrows():
-        for f in FOIL_NAMES:
-            scores[f] += {1: 3, 2: 2, 3: 1}.get(r[f], 0)
-
-        if user["Disziplin"] not in WIND_IRRELEVANT and r["Wind"] == user["Wind"]:
-            for f in FOIL_NAMES:
-                if r[f] == 1:
-                    scores[f] += 1
-
-        if r["Wellen"] == user["Wellen"]:
-            for f in FOIL_NAMES:
-                if r[f] == 1:
-                    scores[f] += 1
-
-    return (
-        pd.DataFrame(scores.items(), columns=["Foil", "Score"])
-        .sort_values("Score", ascending=False)
-        .reset_index(drop=True)
-    )
-
 # =========================================================
 # UI HEADER
 # =========================================================
 st.title("🪁 Foilfinder")
 compare_mode = st.checkbox("🔁 Vergleich Foil A / Foil B")
 
-DISZIPLINEN_UI = [display_disziplin(d) for d in df["Disziplin"].unique()]
-LEVELS = df["Level"].unique()
-GEWICHTE = df["Gewicht"].unique()
-WINDE = df["Wind"].unique()
-WELLEN = df["Wellen"].unique()
+DISZIPLINEN_UI = [display_disziplin(d) for d in TABLES["values"]["Disziplin"]]
+LEVELS = TABLES["values"]["Level"]
+GEWICHTE = TABLES["values"]["Gewicht"]
+WINDE = TABLES["values"]["Wind"]
+WELLEN = TABLES["values"]["Wellen"]
 
 # =========================================================
 # INPUT FORM
@@ -181,8 +152,8 @@ with st.form("finder"):
 # CALCULATION
 # =========================================================
 if submit:
-    st.session_state.result_a = recommend(df, users[0])
-    st.session_state.result_b = recommend(df, users[1]) if compare_mode else None
+    st.session_state.result_a = cached_recommend(users[0])
+    st.session_state.result_b = cached_recommend(users[1]) if compare_mode else None
 
 # =========================================================
 # RESULTS
@@ -196,27 +167,27 @@ if st.session_state.result_a is not None:
 
         with ca:
             st.subheader("🏆 Foil A – Top 3")
-            for i, r in st.session_state.result_a.head(3).iterrows():
-                if st.button(f"{medals[i]} {r['Foil']}", key=f"a_{r['Foil']}"):
-                    st.session_state.selected_foil = r["Foil"]
+            for i, foil in enumerate(top_foils(st.session_state.result_a)):
+                if st.button(f"{medals[i]} {foil}", key=f"a_{foil}"):
+                    st.session_state.selected_foil = foil
 
         with cb:
             st.subheader("🏆 Foil B – Top 3")
-            for i, r in st.session_state.result_b.head(3).iterrows():
-                if st.button(f"{medals[i]} {r['Foil']}", key=f"b_{r['Foil']}"):
-                    st.session_state.selected_foil = r["Foil"]
+            for i, foil in enumerate(top_foils(st.session_state.result_b)):
+                if st.button(f"{medals[i]} {foil}", key=f"b_{foil}"):
+                    st.session_state.selected_foil = foil
     else:
         st.subheader("🏆 Top-Empfehlungen")
-        for i, r in st.session_state.result_a.head(3).iterrows():
-            if st.button(f"{medals[i]} {r['Foil']}", key=f"s_{r['Foil']}"):
-                st.session_state.selected_foil = r["Foil"]
+        for i, foil in enumerate(top_foils(st.session_state.result_a)):
+            if st.button(f"{medals[i]} {foil}", key=f"s_{foil}"):
+                st.session_state.selected_foil = foil
 
 # =========================================================
 # FOIL SPECS
 # =========================================================
 if st.session_state.selected_foil:
     foil = st.session_state.selected_foil
-    specs = FOIL_SPECS.get(foil)
+    specs = foil_specs(foil)
 
     st.divider()
     st.subheader(f"🔍 Specs – {foil}")
@@ -227,3 +198,11 @@ if st.session_state.selected_foil:
             cols[i % 3].metric(k, fmt(v))
     else:
         st.warning(f"Keine Specs für {foil} hinterlegt.")
+
+# =========================================================
+# DEBUG (?debug=1)
+# =========================================================
+if st.query_params.get("debug") == "1":
+    st.divider()
+    st.subheader("🛠 Ergebnis-Cache")
+    st.dataframe(cache_stats(), hide_index=True, use_container_width=True)
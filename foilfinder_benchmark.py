@@ -0,0 +1,98 @@
+# foilfinder_benchmark.py
+# Vergleicht die Score-Kernel aus foilfinder_engine über alle Kombinationen der CSV:
+# - recommend_reference  (iterrows-Schleife)
+# - recommend_vectorized (NumPy-Kernel auf gefilterten Zeilen)
+# - recommend            (vorberechneter Index)
+# - recommend_batch      (alle Profile in einem Durchgang)
+
+import itertools
+import time
+
+import pandas as pd
+
+from foilfinder_engine import (
+    META_COLS,
+    build_index,
+    recommend,
+    recommend_batch,
+    recommend_reference,
+    recommend_vectorized,
+)
+
+DATA_FILE = "foilfinder_functional_fixed.csv"
+
+# ============================================
+# ALLE KOMBINATIONEN
+# ============================================
+def all_users(df):
+    """Alle Kombinationen der CSV-Werte, inkl. 'nicht relevant' wie vom UI gesendet"""
+    values = [list(df[c].unique()) for c in META_COLS]
+    values[3].append("nicht relevant")  # Kategorie
+    values[4].append("nicht relevant")  # Wind
+    for combo in itertools.product(*values):
+        yield dict(zip(META_COLS, combo))
+
+
+def timed(fn, df_or_index, users):
+    start = time.perf_counter()
+    results = [fn(df_or_index, u) for u in users]
+    return results, time.perf_counter() - start
+
+
+# ============================================
+# VERGLEICH
+# ============================================
+if __name__ == "__main__":
+    df = pd.read_csv(DATA_FILE)
+    users = list(all_users(df))
+
+    start = time.perf_counter()
+    index = build_index(df)
+    t_index = time.perf_counter() - start
+
+    ref, t_ref = timed(recommend_reference, df, users)
+    vec, t_vec = timed(recommend_vectorized, df, users)
+    idx, t_idx = timed(recommend, index, users)
+
+    start = time.perf_counter()
+    batch = recommend_batch(df, users, top_n=len(index["foils"]), index=index)
+    t_batch = time.perf_counter() - start
+
+    mismatches = 0
+    for u, a, b, c in zip(users, ref, vec, idx):
+        if a is None:
+            same = b is None and c is None
+        else:
+            # Referenz als DataFrame, recommend / recommend_vectorized als (Foils, Scores)
+            a = (tuple(a["Foil"]), tuple(a["Score"]))
+            same = a == b == c
+        if not same:
+            mismatches += 1
+            print(f"❌ Abweichung: {u}")
+
+    for i, c in enumerate(idx):
+        row = batch.iloc[i]
+        if c is None:
+            same = pd.isna(row["Empf1"])
+        else:
+            same = all(
+                row[f"Empf{j + 1}"] == foil and row[f"Empf{j + 1}_Score"] == score
+                for j, (foil, score) in enumerate(zip(*c))
+            )
+        if not same:
+            mismatches += 1
+            print(f"❌ Abweichung (batch): {users[i]}")
+
+    print("=" * 80)
+    print("FOILFINDER RECOMMEND – KERNEL BENCHMARK")
+    print("=" * 80)
+    print(f"Kombinationen: {len(users)}")
+    print(f"Index bauen  : {t_index * 1e3:8.1f} ms")
+    for name, t in [("reference", t_ref), ("vectorized", t_vec), ("index", t_idx)]:
+        print(f"{name:<13}: {t * 1e3:8.1f} ms gesamt  {t / len(users) * 1e6:8.1f} µs/Anfrage")
+    print(f"{'batch':<13}: {t_batch * 1e3:8.1f} ms gesamt  {t_batch / len(users) * 1e6:8.1f} µs/Profil")
+    print(f"Speedup index vs reference: {t_ref / t_idx:.0f}×")
+    print(f"Abweichungen (Scores + Reihenfolge): {mismatches}")
+    print("=" * 80)
+
+    raise SystemExit(1 if mismatches else 0)
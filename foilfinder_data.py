@@ -0,0 +1,99 @@
+# foilfinder_data.py
+# Gemeinsame Daten-Schicht für die Streamlit-Apps
+# CSV wird einmal pro Prozess gelesen (Streamlit führt nur das App-Skript neu aus,
+# importierte Module bleiben geladen) und neu gelesen, sobald sich die Datei ändert.
+
+import os
+from types import MappingProxyType
+
+import numpy as np
+
+_CACHE = {}
+
+
+def file_version(path):
+    """(mtime_ns, size) – ändert sich bei jedem Speichern der Datei"""
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def freeze(obj):
+    """Macht dicts/lists/NumPy-Arrays rekursiv read-only"""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(freeze(v) for v in obj)
+    if isinstance(obj, np.ndarray):
+        obj.flags.writeable = False
+    return obj
+
+
+def _cached(key, path, build):
+    version = file_version(path)
+    hit = _CACHE.get(key)
+    if hit is not None and hit[0] == version:
+        return hit[1]
+    value = build()
+    _CACHE[key] = (version, value)
+    return value
+
+
+def load_csv(path, sep=","):
+    """
+    Geteiltes DataFrame – NICHT verändern, vorher .copy().
+    Alle Sessions bekommen dasselbe Objekt, solange die Datei unverändert ist.
+    """
+    import pandas as pd
+
+    return _cached(("csv", path, sep), path, lambda: pd.read_csv(path, sep=sep))
+
+
+def load_table(path):
+    """
+    Wie load_csv, liest aber die kompilierte .npz (foilfinder_matrix.py),
+    sofern sie zur aktuellen CSV-Version passt. Trennzeichen wird erkannt.
+    """
+    from foilfinder_matrix import compiled_path, is_fresh, load_matrix, sniff_sep, to_dataframe
+
+    def build():
+        import pandas as pd
+
+        if is_fresh(path):
+            return to_dataframe(load_matrix(compiled_path(path)))
+        return pd.read_csv(path, sep=sniff_sep(path))
+
+    return _cached(("table", path), path, build)
+
+
+def load_source(path):
+    """
+    Kompilierte Matrix (dict, codes/ranks als memmap), sofern die .npz frisch ist,
+    sonst das DataFrame aus load_table. Die Matrix wird nicht in ein DataFrame kopiert –
+    alle Prozesse lesen dieselben Seiten aus dem Page-Cache.
+    """
+    from foilfinder_matrix import compiled_path, is_fresh, load_matrix
+
+    if is_fresh(path):
+        return load_matrix(compiled_path(path))
+    return load_table(path)
+
+
+def derived(path, build):
+    """
+    build(source) einmal pro Dateiversion auswerten; source = load_source(path)
+    (Matrix oder DataFrame – build_index / column_values können beides).
+    Ergebnis wird eingefroren (MappingProxyType / tuple / read-only Arrays).
+    """
+    return _cached(
+        ("derived", path, build.__module__, build.__qualname__),
+        path,
+        lambda: freeze(build(load_source(path))),
+    )
+
+
+def column_values(df, cols):
+    """Eindeutige Werte pro Spalte in CSV-Reihenfolge (df: DataFrame oder kompilierte Matrix)"""
+    if isinstance(df, dict):
+        # Wörterbücher aus pd.factorize – ebenfalls in Reihenfolge des ersten Auftretens
+        return {c: [str(v) for v in df["categories"][c]] for c in cols}
+    return {c: list(df[c].unique()) for c in cols}
@@ -0,0 +1,352 @@
+# foilfinder_engine.py
+# Empfehlungslogik für foilfinder_app.py (CSV-Matrix)
+# Index wird einmal beim Laden gebaut, jede Anfrage ist danach ein Dict-Lookup
+# Nur NumPy beim Import – pandas wird erst geladen, wenn ein DataFrame gebraucht wird
+
+import numpy as np
+
+# =========================================================
+# REGELN
+# =========================================================
+META_COLS = ["Disziplin", "Level", "Gewicht", "Kategorie", "Wind", "Wellen"]
+
+# Disziplinen ohne Wind
+WIND_IRRELEVANT = ["Pronefoil", "Pumpfoil", "Downwind"]  # Downwind = SUP-Foiling
+
+# Disziplinen ohne Kategorie-Filter
+KATEGORIE_IRRELEVANT = ["Pronefoil", "Pumpfoil"]
+
+# Auswahl im UI: Kategorien / Wellen, die pro Disziplin NICHT angeboten werden
+KATEGORIE_AUSSCHLUSS = {"Downwind": ["Jumping", "Lightwindfoil"]}
+WELLEN_AUSSCHLUSS = {"Pronefoil": ["Flachwasser"]}
+
+# Anzeige-Namen (intern → UI)
+DISZIPLIN_LABELS = {"Downwind": "SUP-Foiling"}
+KATEGORIE_LABELS = {"Downwind": "SUP-Foiling"}
+
+# Rang → Punkte als Lookup-Array (Index = Rang 0..3)
+RANK_POINTS = np.array([0, 3, 2, 1], dtype=np.int64)
+
+
+def foil_names(df):
+    return [c for c in df.columns if c not in META_COLS]
+
+
+def input_options(values):
+    """
+    Auswahl pro Disziplin aus den CSV-Werten (column_values):
+    {"kategorien": {Disziplin: [...]}, "wellen": {Disziplin: [...]}} – leere Liste = nicht relevant
+    """
+    kategorien = {
+        d: [] if d in KATEGORIE_IRRELEVANT
+        else [k for k in values["Kategorie"] if k not in KATEGORIE_AUSSCHLUSS.get(d, [])]
+        for d in values["Disziplin"]
+    }
+    wellen = {
+        d: [w for w in values["Wellen"] if w not in WELLEN_AUSSCHLUSS.get(d, [])]
+        for d in values["Disziplin"]
+    }
+    return {"kategorien": kategorien, "wellen": wellen}
+
+
+def index_key(user):
+    """(Disziplin, Level, Gewicht, Kategorie) – Kategorie None, wenn nicht relevant"""
+    kat = None if user["Disziplin"] in KATEGORIE_IRRELEVANT else user["Kategorie"]
+    return (user["Disziplin"], user["Level"], user["Gewicht"], kat)
+
+
+def profile_key(user):
+    """Normalisiertes Profil (Cache-Schlüssel): nicht relevante Felder = None"""
+    wind = None if user["Disziplin"] in WIND_IRRELEVANT else user["Wind"]
+    return index_key(user) + (wind, user["Wellen"])
+
+
+# =========================================================
+# SCORE KERNEL
+# =========================================================
+def top1_bonus(ranks, match):
+    """+1 pro Zeile, in der das Foil Top-1 ist und die Bedingung passt"""
+    return (match[:, None] & (ranks == 1)).sum(axis=0)
+
+
+def score_ranks(ranks, wind_match=None, wellen_match=None):
+    """
+    Vektorisierter Score über eine Rang-Matrix (Zeilen × Foils):
+    Rang-Punkte + Top-1-Bonus für Zeilen mit passendem Wind / passenden Wellen
+    """
+    scores = RANK_POINTS[ranks].sum(axis=0)
+    if wind_match is not None:
+        scores += top1_bonus(ranks, wind_match)
+    if wellen_match is not None:
+        scores += top1_bonus(ranks, wellen_match)
+    return scores
+
+
+# =========================================================
+# INDEX
+# =========================================================
+INDEX_COLS = ["Disziplin", "Level", "Gewicht", "Kategorie"]
+
+
+def index_entry(foils, ranks, wind, wellen):
+    entry = {
+        "base": score_ranks(ranks),
+        "wind": {w: top1_bonus(ranks, wind == w) for w in np.unique(wind)},
+        "wellen": {w: top1_bonus(ranks, wellen == w) for w in np.unique(wellen)},
+    }
+    entry["ranked"] = ranked_orders(foils, entry)
+    return entry
+
+
+def ranked_orders(foils, entry):
+    """
+    Fertige Rangfolge (Foils, Scores) pro (Wind, Wellen) – None = kein Bonus
+    (Wert nicht in der Gruppe oder Wind nicht relevant). recommend ist damit ein Dict-Lookup.
+    """
+    winds = [None, *entry["wind"]]
+    wellen = [None, *entry["wellen"]]
+    zero = np.zeros_like(entry["base"])
+    wind = np.stack([zero, *entry["wind"].values()])
+    wave = np.stack([zero, *entry["wellen"].values()])
+
+    scores = entry["base"] + wind[:, None, :] + wave[None, :, :]   # (Wind, Wellen, Foils)
+    order = rank_order(scores)
+    ranked_foils = foils[order]
+    ranked_scores = np.take_along_axis(scores, order, axis=-1)
+    return {
+        (w, v): (tuple(ranked_foils[i, j].tolist()), tuple(ranked_scores[i, j].tolist()))
+        for i, w in enumerate(winds)
+        for j, v in enumerate(wellen)
+    }
+
+
+def build_index(df):
+    """
+    Baut pro (Disziplin, Level, Gewicht, Kategorie) die vorberechneten Punkte-Vektoren:
+    - base:   Summe der Rang-Punkte über alle Zeilen
+    - wind:   Wind-Wert → Anzahl Top-1 in Zeilen mit diesem Wind
+    - wellen: Wellen-Wert → Anzahl Top-1 in Zeilen mit diesen Wellen
+    df darf auch eine kompilierte Matrix sein (foilfinder_matrix.load_matrix) → build_index_matrix
+    """
+    if isinstance(df, dict):
+        return build_index_matrix(df)
+
+    import pandas as pd
+
+    foils = foil_names(df)
+    foil_array = np.array(foils, dtype=object)
+    keys = df[INDEX_COLS].copy()
+    keys.loc[keys["Disziplin"].isin(KATEGORIE_IRRELEVANT), "Kategorie"] = None
+
+    entries = {}
+    for key, rows in df.groupby([keys[c] for c in keys.columns], sort=False, dropna=False).groups.items():
+        key = tuple(None if pd.isna(k) else k for k in key)
+        sub = df.loc[rows]
+        entries[key] = index_entry(
+            foil_array, sub[foils].to_numpy(dtype=np.int8), sub["Wind"].to_numpy(), sub["Wellen"].to_numpy()
+        )
+
+    return {"foils": foil_array, "entries": entries}
+
+
+def build_index_matrix(matrix):
+    """
+    Wie build_index, aber direkt auf den memmap-Arrays der .npz (ohne DataFrame):
+    pro Gruppe wird nur deren Zeilenblock kurz gelesen, der Index hält nur die
+    Punkte-Vektoren. Die Rang-Matrix selbst bleibt im geteilten Page-Cache.
+    """
+    meta = matrix["meta"]
+    foils = np.array(matrix["foils"], dtype=object)
+    cats = {c: matrix["categories"][c].astype(object) for c in META_COLS}
+    codes = {c: np.asarray(matrix["codes"][:, meta.index(c)], dtype=np.int16) for c in META_COLS}
+
+    keys = np.stack([codes[c] for c in INDEX_COLS], axis=1)
+    irrelevant = np.isin(cats["Disziplin"][codes["Disziplin"]], KATEGORIE_IRRELEVANT)
+    keys[irrelevant, INDEX_COLS.index("Kategorie")] = -1
+
+    # Gruppen in Reihenfolge des ersten Auftretens (wie groupby(sort=False))
+    unique, first, inverse, counts = np.unique(
+        keys, axis=0, return_index=True, return_inverse=True, return_counts=True
+    )
+    groups = np.split(np.argsort(inverse.ravel(), kind="stable"), np.cumsum(counts)[:-1])
+
+    entries = {}
+    for g in np.argsort(first):
+        rows = groups[g]
+        key = tuple(None if k < 0 else cats[c][k] for c, k in zip(INDEX_COLS, unique[g]))
+        entries[key] = index_entry(
+            foils,
+            np.asarray(matrix["ranks"][rows], dtype=np.int8),
+            cats["Wind"][codes["Wind"][rows]],
+            cats["Wellen"][codes["Wellen"][rows]],
+        )
+
+    return {"foils": foils, "entries": entries}
+
+
+def batch_tables(index):
+    """
+    Stapelt die Index-Vektoren zu dichten Arrays für recommend_batch:
+    base[K, F], wind[K, W+1, F], wellen[K, V+1, F] – letzter Slot = kein Bonus.
+    Erst in recommend_batch gebaut (pandas-Indizes), nicht beim Laden des Index.
+    """
+    import pandas as pd
+
+    entries = index["entries"]
+    n_foils = len(index["foils"])
+    winds = sorted({w for e in entries.values() for w in e["wind"]})
+    wellen = sorted({w for e in entries.values() for w in e["wellen"]})
+
+    base = np.zeros((len(entries), n_foils), dtype=np.int64)
+    wind = np.zeros((len(entries), len(winds) + 1, n_foils), dtype=np.int64)
+    wave = np.zeros((len(entries), len(wellen) + 1, n_foils), dtype=np.int64)
+
+    for k, e in enumerate(entries.values()):
+        base[k] = e["base"]
+        for w, bonus in e["wind"].items():
+            wind[k, winds.index(w)] = bonus
+        for w, bonus in e["wellen"].items():
+            wave[k, wellen.index(w)] = bonus
+
+    keys = [tuple("" if v is None else v for v in key) for key in entries]
+    return {
+        "keys": pd.MultiIndex.from_tuples(keys),
+        "winds": pd.Index(winds),
+        "wellen": pd.Index(wellen),
+        "base": base,
+        "wind": wind,
+        "wave": wave,
+    }
+
+
+# =========================================================
+# RECOMMENDATION
+# =========================================================
+def rank_order(scores):
+    """Indizes nach Score absteigend (letzte Achse) – gleiche Reihenfolge bei Gleichstand wie sort_values()"""
+    n_foils = scores.shape[-1]
+    return np.arange(n_foils)[::-1][scores[..., ::-1].argsort(axis=-1, kind="quicksort")][..., ::-1]
+
+
+def ranking(foils, scores):
+    """(Foils, Scores) nach Score absteigend, als Tupel"""
+    order = rank_order(scores)
+    return tuple(foils[order].tolist()), tuple(scores[order].tolist())
+
+
+def base_rows(df, user):
+    base = df[
+        (df["Disziplin"] == user["Disziplin"]) &
+        (df["Level"] == user["Level"]) &
+        (df["Gewicht"] == user["Gewicht"])
+    ]
+
+    # Kategorie nur filtern, wenn relevant
+    if user["Disziplin"] not in KATEGORIE_IRRELEVANT:
+        base = base[base["Kategorie"] == user["Kategorie"]]
+
+    return base
+
+
+def recommend_reference(df, user):
+    """Ursprüngliche iterrows-Schleife – Referenz für recommend_vectorized / recommend"""
+    import pandas as pd
+
+    base = base_rows(df, user)
+    if base.empty:
+        return None
+
+    foils = foil_names(df)
+    scores = {f: 0 for f in foils}
+
+    for _, r in base.iterrows():
+        for f in foils:
+            scores[f] += {1: 3, 2: 2, 3: 1}.get(r[f], 0)
+
+        if user["Disziplin"] not in WIND_IRRELEVANT and r["Wind"] == user["Wind"]:
+            for f in foils:
+                if r[f] == 1:
+                    scores[f] += 1
+
+        if r["Wellen"] == user["Wellen"]:
+            for f in foils:
+                if r[f] == 1:
+                    scores[f] += 1
+
+    return (
+        pd.DataFrame(scores.items(), columns=["Foil", "Score"])
+        .sort_values("Score", ascending=False)
+        .reset_index(drop=True)
+    )
+
+
+def recommend_vectorized(df, user):
+    """Wie recommend_reference, aber ein einziger Kernel-Aufruf über alle Basiszeilen"""
+    base = base_rows(df, user)
+    if base.empty:
+        return None
+
+    foils = foil_names(df)
+    wind_match = None
+    if user["Disziplin"] not in WIND_IRRELEVANT:
+        wind_match = base["Wind"].to_numpy() == user["Wind"]
+
+    scores = score_ranks(
+        base[foils].to_numpy(dtype=np.int8),
+        wind_match,
+        base["Wellen"].to_numpy() == user["Wellen"],
+    )
+    return ranking(np.array(foils, dtype=object), scores)
+
+
+def recommend(index, user):
+    """(Foils, Scores) nach Score absteigend oder None – vorberechnet im Index (ranked_orders)"""
+    entry = index["entries"].get(index_key(user))
+    if entry is None:
+        return None
+
+    wind = None
+    if user["Disziplin"] not in WIND_IRRELEVANT and user["Wind"] in entry["wind"]:
+        wind = user["Wind"]
+
+    wellen = user["Wellen"] if user["Wellen"] in entry["wellen"] else None
+
+    return entry["ranked"][(wind, wellen)]
+
+
+def recommend_batch(df, users, top_n=3, index=None):
+    """
+    Top-N Foils für viele Profile in einem vektorisierten Durchgang.
+    users: DataFrame (oder Liste von Dicts) mit den META_COLS.
+    Rückgabe: users + Spalten Empf1, Empf1_Score, ... (None, wenn keine Basiszeilen).
+    """
+    import pandas as pd
+
+    if index is None:
+        index = build_index(df)
+    tables = batch_tables(index)
+    users = pd.DataFrame(users).reset_index(drop=True)
+
+    disz = users["Disziplin"]
+    kat = users["Kategorie"].where(~disz.isin(KATEGORIE_IRRELEVANT), "")
+    k = tables["keys"].get_indexer(
+        pd.MultiIndex.from_arrays([disz, users["Level"], users["Gewicht"], kat])
+    )
+    w = tables["winds"].get_indexer(users["Wind"])
+    w[(w < 0) | disz.isin(WIND_IRRELEVANT).to_numpy()] = len(tables["winds"])
+    v = tables["wellen"].get_indexer(users["Wellen"])
+    v[v < 0] = len(tables["wellen"])
+
+    found = k >= 0
+    k = np.where(found, k, 0)
+    scores = tables["base"][k] + tables["wind"][k, w] + tables["wave"][k, v]
+
+    # gleiche Reihenfolge bei Gleichstand wie ranking()
+    order = rank_order(scores)[:, :top_n]
+    top_scores = np.take_along_axis(scores, order, axis=1)
+
+    result = users.copy()
+    for i in range(order.shape[1]):
+        result[f"Empf{i + 1}"] = np.where(found, index["foils"][order[:, i]], None)
+        result[f"Empf{i + 1}_Score"] = pd.Series(top_scores[:, i], dtype="Int64").where(found)
+    return result
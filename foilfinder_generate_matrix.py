@@ -2,9 +2,32 @@
 # Generates full foil-size recommendation matrix (0/1/2/3)
 # Python = single source of truth
 # Downwind-Wave implemented as CATEGORY (Flow-pushing)
-
+#
+# Rows are streamed from itertools.product(...) and written in chunks,
+# so memory stays flat for large input spaces.
+# With --workers N the blocks / partitions are scored in a process pool;
+# output order stays the same.
+#
+# Two engines:
+#   loop        recommend_row() per combination – reference implementation
+#   vectorized  every dimension as integer codes, whole blocks as NumPy array ops
+# --check generates both and diffs them cell by cell.
+# Importing the module only needs NumPy; pandas is loaded by the writers.
+#
+# Usage: python foilfinder_generate_matrix.py [--out foilfinder_parawing.csv|.parquet]
+#                                             [--engine vectorized|loop] [--check]
+#                                             [--chunk-size N] [--workers N]
+#                                             [--disciplines Parawing ... | all]
+
+import argparse
 import itertools
-import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from foil_catalog import FAMILIES
+from foil_sizing import size_index
 
 # ------------------------------------------------------------
 # INPUT SPACE (UI)
@@ -31,14 +54,10 @@ WELLEN = ["Flachwasser", "Kleine Wellen", "Grosse Wellen"]
 # ------------------------------------------------------------
 # FOIL SIZES (MATCH HEADER)
 # ------------------------------------------------------------
+# From foil_catalog, keyed by the family name used in the matrix header
+# ("Flow", not "Flow Ace").
 
-FOIL_SIZES = {
-    "Infinity Ace": [540, 690, 840, 990, 1140, 1390],
-    "Stride Ace": [1360, 1740],
-    "Stride": [2050],
-    "Pacer": [950, 1250, 1550, 1850, 2200],
-    "Flow": [720, 900, 1080, 1260],
-}
+FOIL_SIZES = {fam.csv_name: fam.sizes.tolist() for fam in FAMILIES}
 
 REFERENCE_SIZE = {
     "Infinity Ace": 990,
@@ -95,7 +114,7 @@ WAVE_OFFSET = {"Flachwasser":0,"Kleine Wellen":0,"Grosse Wellen":-1}
 
 def target_index(foil, weight, discipline, wind, wave):
     sizes = FOIL_SIZES[foil]
-    idx = sizes.index(REFERENCE_SIZE[foil])
+    idx = size_index(foil, REFERENCE_SIZE[foil])
     idx += WEIGHT_OFFSET[weight]
     idx += DISCIPLINE_OFFSET.get(discipline, 0)
     idx += WIND_OFFSET[wind]
@@ -122,53 +141,78 @@ def foil_score(foil, discipline, category):
     return base
 
 # ------------------------------------------------------------
-# GENERATE MATRIX
+# LOOKUP TABLES (computed once from foil_score / target_index)
 # ------------------------------------------------------------
+# Both functions depend only on a few small categorical inputs, so they are
+# evaluated once over their whole domain and generation reads dense arrays
+# indexed by category codes.
+
+FOIL_CODE = {f: i for i, f in enumerate(FOIL_SIZES)}
+DISCIPLINE_CODE = {d: i for i, d in enumerate(DISCIPLINE_WEIGHTS)}
+CATEGORY_CODE = {c: i for i, c in enumerate(KATEGORIE)}
+WEIGHT_CODE = {w: i for i, w in enumerate(GEWICHT)}
+WIND_CODE = {w: i for i, w in enumerate(WIND)}
+WAVE_CODE = {w: i for i, w in enumerate(WELLEN)}
+
+# FOIL_SCORE_TABLE[foil, discipline, category]
+FOIL_SCORE_TABLE = np.array([
+    [[foil_score(f, d, c) for c in KATEGORIE] for d in DISCIPLINE_WEIGHTS]
+    for f in FOIL_SIZES
+])
+
+# TARGET_INDEX_TABLE[foil, weight, discipline, wind, wave]
+TARGET_INDEX_TABLE = np.array([
+    [[[[target_index(f, g, d, w, wa) for wa in WELLEN] for w in WIND]
+      for d in DISCIPLINE_WEIGHTS] for g in GEWICHT]
+    for f in FOIL_SIZES
+])
 
-rows = []
+# ------------------------------------------------------------
+# ROW LAYOUT
+# ------------------------------------------------------------
 
-for combo in itertools.product(DISCIPLINES, LEVELS, GEWICHT, KATEGORIE, WIND, WELLEN):
-    discipline, level, weight, category, wind, wave = combo
+META_COLUMNS = ["Disziplin", "Level", "Gewicht", "Kategorie", "Wind", "Wellen"]
+FOIL_COLUMNS = [f"{foil} {s}" for foil, sizes in FOIL_SIZES.items() for s in sizes]
+COLUMNS = META_COLUMNS + FOIL_COLUMNS
+FOIL_COLUMN_INDEX = {c: i for i, c in enumerate(FOIL_COLUMNS)}
 
-    row = {
-        "Disziplin": discipline,
-        "Level": level,
-        "Gewicht": weight,
-        "Kategorie": category,
-        "Wind": wind,
-        "Wellen": wave,
-    }
+# ------------------------------------------------------------
+# RECOMMEND ONE ROW
+# ------------------------------------------------------------
 
-    # initialise foil columns
-    for foil, sizes in FOIL_SIZES.items():
-        for s in sizes:
-            row[f"{foil} {s}"] = 0
+def recommend_row(discipline, level, weight, category, wind, wave):
+    """Foil column values (0/1/2/3) in FOIL_COLUMNS order."""
+    values = [0] * len(FOIL_COLUMNS)
+
+    d = DISCIPLINE_CODE[discipline]
+    c = CATEGORY_CODE[category]
+    targets = TARGET_INDEX_TABLE[:, WEIGHT_CODE[weight], d, WIND_CODE[wind], WAVE_CODE[wave]].tolist()
+    scores = FOIL_SCORE_TABLE[:, d, c].tolist()
 
     candidates = []
 
-    for foil in FOIL_SIZES:
+    for fc, foil in enumerate(FOIL_SIZES):
         if not is_valid(level, category, foil):
             continue
 
-        idx = target_index(foil, weight, discipline, wind, wave)
+        idx = targets[fc]
         size = FOIL_SIZES[foil][idx]
-        score = foil_score(foil, discipline, category)
+        score = scores[fc]
 
         candidates.append((foil, size, idx, score))
 
     candidates.sort(key=lambda x: x[3], reverse=True)
     if not candidates:
-        rows.append(row)
-        continue
+        return values
 
     # Recommendation 1
     f1, s1, i1, _ = candidates[0]
-    row[f"{f1} {s1}"] = 3
+    values[FOIL_COLUMN_INDEX[f"{f1} {s1}"]] = 3
 
     # Recommendation 2 (different foil)
     for f, s, i, _ in candidates[1:]:
         if f != f1:
-            row[f"{f} {s}"] = 2
+            values[FOIL_COLUMN_INDEX[f"{f} {s}"]] = 2
             break
 
     # Recommendation 3 (same foil, neighbour size)
@@ -180,15 +224,267 @@ for combo in itertools.product(DISCIPLINES, LEVELS, GEWICHT, KATEGORIE, WIND, WE
 
     for ni in neighbour_order:
         if 0 <= ni < len(sizes):
-            row[f"{f1} {sizes[ni]}"] = 1
+            values[FOIL_COLUMN_INDEX[f"{f1} {sizes[ni]}"]] = 1
             break
 
-    rows.append(row)
+    return values
+
+# ------------------------------------------------------------
+# GENERATE MATRIX (streaming)
+# ------------------------------------------------------------
+
+def partitions(disciplines=DISCIPLINES):
+    """(discipline, level) blocks – concatenated in this order they give the full product."""
+    return list(itertools.product(disciplines, LEVELS))
+
+def iter_partition(part):
+    discipline, level = part
+    for combo in itertools.product([discipline], [level], GEWICHT, KATEGORIE, WIND, WELLEN):
+        yield list(combo) + recommend_row(*combo)
+
+def partition_rows(part):
+    """Worker entry point (must be module level for the process pool)."""
+    return list(iter_partition(part))
+
+def iter_rows(disciplines=DISCIPLINES, workers=1):
+    """Yield one list per combination, in COLUMNS order."""
+    parts = partitions(disciplines)
+
+    if workers <= 1:
+        for part in parts:
+            yield from iter_partition(part)
+        return
+
+    # at most 2 × workers partitions in flight, results consumed in submit order
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for part in parts:
+            pending.append(pool.submit(partition_rows, part))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def iter_chunks(rows, chunk_size):
+    """Group rows into DataFrames of at most chunk_size rows."""
+    import pandas as pd
+
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield pd.DataFrame(chunk, columns=COLUMNS)
+            chunk = []
+    if chunk:
+        yield pd.DataFrame(chunk, columns=COLUMNS)
+
+# ------------------------------------------------------------
+# VECTORIZED ENGINE
+# ------------------------------------------------------------
+# Work is split into blocks = (discipline, level, weight); one block holds every
+# category × wind × wave combination. Axes inside a call: block, category, wind,
+# wave, foil. Blocks in product order give the same rows as itertools.product(...).
+# Chunks are runs of whole blocks (--chunk-size), so memory stays flat and
+# --workers can score chunks in a process pool.
+
+FOIL_LIST = list(FOIL_SIZES)
+N_SIZES = np.array([len(FOIL_SIZES[f]) for f in FOIL_LIST])
+REFERENCE_INDEX = np.array([size_index(f, REFERENCE_SIZE[f]) for f in FOIL_LIST])
+COLUMN_OFFSET = np.concatenate([[0], np.cumsum(N_SIZES)[:-1]])
+BLOCK_ROWS = len(KATEGORIE) * len(WIND) * len(WELLEN)
+
+# VALID_MASK[level, category, foil]
+VALID_MASK = np.array([
+    [[is_valid(l, c, f) for f in FOIL_LIST] for c in KATEGORIE] for l in LEVELS
+])
+
+def along(values, axis, ndim=5):
+    """Reshape a 1-D array so it broadcasts along one of the 5 axes."""
+    shape = [1] * ndim
+    shape[axis] = -1
+    return np.asarray(values).reshape(shape)
+
+def blocks(disciplines=DISCIPLINES):
+    """(discipline, level, weight) in output order."""
+    return list(itertools.product(disciplines, LEVELS, GEWICHT))
+
+def generate_blocks(block_list):
+    """Rows of the given (discipline, level, weight) blocks as one DataFrame."""
+    import pandas as pd
+
+    b_disc, b_level, b_weight = (list(col) for col in zip(*block_list))
+    d_code = np.array([DISCIPLINE_CODE[d] for d in b_disc])
+    l_code = np.array([LEVELS.index(l) for l in b_level])
+    dims = (len(block_list), len(KATEGORIE), len(WIND), len(WELLEN))
+    n_rows = int(np.prod(dims))
+
+    # target size index: reference + broadcast offsets, clamped per foil
+    target = (
+        along(REFERENCE_INDEX, 4)
+        + along([DISCIPLINE_OFFSET.get(d, 0) + WEIGHT_OFFSET[g] for d, g in zip(b_disc, b_weight)], 0)
+        + along([WIND_OFFSET[w] for w in WIND], 2)
+        + along([WAVE_OFFSET[w] for w in WELLEN], 3)
+    )
+    target = np.clip(target, 0, N_SIZES - 1)
+    target = np.broadcast_to(target, dims + (len(FOIL_LIST),))
+
+    # candidate order: score descending, invalid foils last, ties keep foil order
+    scores = FOIL_SCORE_TABLE[:, d_code].transpose(1, 2, 0)              # [B, C, F]
+    valid = VALID_MASK[l_code]                                            # [B, C, F]
+    order = np.argsort(-np.where(valid, scores, -np.inf), axis=-1, kind="stable")
+
+    def per_row(a):
+        """[B, C] → flat per output row."""
+        return np.broadcast_to(a[:, :, None, None], dims).reshape(-1)
+
+    f1 = per_row(order[..., 0])
+    f2 = per_row(order[..., 1]) if len(FOIL_LIST) > 1 else f1
+    n_valid = per_row(valid.sum(axis=-1))
+
+    flat_target = target.reshape(n_rows, len(FOIL_LIST))
+    rows = np.arange(n_rows)
+    i1 = flat_target[rows, f1]
+    i2 = flat_target[rows, f2]
+
+    values = np.zeros((n_rows, len(FOIL_COLUMNS)), dtype=np.int64)
+
+    # Recommendation 1 / 2
+    has1 = n_valid >= 1
+    has2 = n_valid >= 2
+    values[rows[has1], (COLUMN_OFFSET[f1] + i1)[has1]] = 3
+    values[rows[has2], (COLUMN_OFFSET[f2] + i2)[has2]] = 2
+
+    # Recommendation 3 (same foil, neighbour size: smaller first, else larger)
+    neighbour = np.where(i1 - 1 >= 0, i1 - 1, i1 + 1)
+    has3 = has1 & (neighbour < N_SIZES[f1])
+    values[rows[has3], (COLUMN_OFFSET[f1] + neighbour)[has3]] = 1
+
+    # meta columns from the flat row codes
+    block, c, w, wa = np.unravel_index(rows, dims)
+    data = {
+        "Disziplin": np.array(b_disc, dtype=object)[block],
+        "Level": np.array(b_level, dtype=object)[block],
+        "Gewicht": np.array(b_weight, dtype=object)[block],
+        "Kategorie": np.array(KATEGORIE, dtype=object)[c],
+        "Wind": np.array(WIND, dtype=object)[w],
+        "Wellen": np.array(WELLEN, dtype=object)[wa],
+    }
+    data.update(zip(FOIL_COLUMNS, values.T))
+    return pd.DataFrame(data, columns=COLUMNS)
+
+def generate_vectorized(disciplines=DISCIPLINES):
+    """Whole matrix for the given disciplines as one DataFrame."""
+    return generate_blocks(blocks(disciplines))
+
+def iter_vectorized_chunks(disciplines=DISCIPLINES, chunk_size=50_000, workers=1):
+    """DataFrames of whole blocks, at most chunk_size rows (at least one block)."""
+    block_list = blocks(disciplines)
+    per_chunk = max(1, chunk_size // BLOCK_ROWS)
+    chunks = [block_list[i:i + per_chunk] for i in range(0, len(block_list), per_chunk)]
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield generate_blocks(chunk)
+        return
+
+    # same bounded pipeline as iter_rows
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(generate_blocks, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+# ------------------------------------------------------------
+# CHECK: vectorized vs loop
+# ------------------------------------------------------------
+
+def compare_engines(disciplines=DISCIPLINES):
+    """Cell-by-cell differences between both engines as (row, column, loop, vectorized)."""
+    import pandas as pd
+
+    loop = pd.DataFrame(list(iter_rows(disciplines)), columns=COLUMNS)
+    vec = generate_vectorized(disciplines)
+
+    if loop.shape != vec.shape:
+        return [(None, "shape", loop.shape, vec.shape)]
+
+    diffs = []
+    for col in COLUMNS:
+        a = loop[col].to_numpy()
+        b = vec[col].to_numpy()
+        for i in np.flatnonzero(a != b):
+            diffs.append((int(i), col, a[i], b[i]))
+    return diffs
 
 # ------------------------------------------------------------
 # EXPORT
 # ------------------------------------------------------------
 
-df = pd.DataFrame(rows)
-df.to_csv("foilfinder_parawing.csv", index=False)
-print(f"Done. Generated {len(df)} rows for Parawing.")
+def write_matrix(rows, path, chunk_size=50_000):
+    """Write rows chunk by chunk to CSV or Parquet (by suffix). Returns row count."""
+    return write_chunks(iter_chunks(rows, chunk_size), path)
+
+def write_chunks(chunks, path):
+    """Write DataFrame chunks to CSV or Parquet (by suffix). Returns row count."""
+    n = 0
+
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet export needs pyarrow (pip install pyarrow)")
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                n += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        return n
+
+    for chunk in chunks:
+        chunk.to_csv(path, index=False, mode="w" if n == 0 else "a", header=n == 0)
+        n += len(chunk)
+    return n
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the foil recommendation matrix.")
+    parser.add_argument("--out", default="foilfinder_parawing.csv", help="output .csv or .parquet")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="rows per write")
+    parser.add_argument("--engine", choices=["vectorized", "loop"], default="vectorized")
+    parser.add_argument("--check", action="store_true",
+                        help="diff vectorized against loop engine cell by cell, write nothing")
+    parser.add_argument("--workers", type=int, default=1, help="processes for scoring")
+    parser.add_argument("--disciplines", nargs="+", default=DISCIPLINES,
+                        help="disciplines to generate ('all' = every key of DISCIPLINE_WEIGHTS)")
+    args = parser.parse_args()
+
+    disciplines = list(DISCIPLINE_WEIGHTS) if args.disciplines == ["all"] else args.disciplines
+    unknown = [d for d in disciplines if d not in DISCIPLINE_WEIGHTS]
+    if unknown:
+        parser.error(f"unknown discipline(s): {', '.join(unknown)}")
+
+    if args.check:
+        diffs = compare_engines(disciplines)
+        for row, col, a, b in diffs[:50]:
+            print(f"row {row}, {col}: loop={a} vectorized={b}")
+        print(f"{len(diffs)} differing cells ({', '.join(disciplines)}).")
+        raise SystemExit(1 if diffs else 0)
+
+    if args.engine == "vectorized":
+        n = write_chunks(iter_vectorized_chunks(disciplines, args.chunk_size, args.workers), args.out)
+    else:
+        n = write_matrix(iter_rows(disciplines, args.workers), args.out, args.chunk_size)
+    print(f"Done. Generated {n} rows for {', '.join(disciplines)}.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# foilfinder_matrix.py
+# Kompaktes Binärformat für die Empfehlungs-Matrizen (statt breiter Text-CSV)
+#
+# Eine unkomprimierte .npz pro CSV:
+#   columns         Spaltenreihenfolge der CSV
+#   meta, foils     Namen der Kategorie- bzw. Rang-Spalten
+#   cat_<i>         Wörterbuch (eindeutige Werte) der i-ten Meta-Spalte
+#   codes           uint8 Zeilen × Meta   – Index ins jeweilige Wörterbuch
+#   ranks           uint8 Zeilen × Foils  – 0 = leer / nicht relevant, 1..3 = Rang
+#   source_version  (mtime_ns, size) der CSV beim Kompilieren
+#
+# codes/ranks liegen unkomprimiert im Zip und werden per np.memmap geöffnet,
+# d.h. mehrere Worker-Prozesse teilen sich dieselben Seiten im Page-Cache.
+#
+# Aufruf:  python foilfinder_matrix.py [csv ...]
+
+import os
+import struct
+import sys
+import zipfile
+
+import numpy as np
+
+from foilfinder_data import file_version
+
+MATRIX_FILES = [
+    "foilfinder_functional_fixed.csv",
+    "foilfinder_parawing.csv",
+    "progress_prefilled_with_discipline.csv",
+]
+
+
+def compiled_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".npz"
+
+
+def sniff_sep(csv_path):
+    """CSVs mischen ',' und ';' – Header entscheidet"""
+    with open(csv_path, encoding="utf-8") as f:
+        header = f.readline()
+    return ";" if header.count(";") > header.count(",") else ","
+
+
+# =========================================================
+# CSV → NPZ
+# =========================================================
+def compile_csv(csv_path, out_path=None):
+    import pandas as pd
+
+    out_path = out_path or compiled_path(csv_path)
+    df = pd.read_csv(csv_path, sep=sniff_sep(csv_path))
+
+    # Text-Spalten = Kategorien, alles andere = Ränge (leere Foil-Spalten sind float/NaN)
+    meta = [c for c in df.columns if not pd.api.types.is_numeric_dtype(df[c])]
+    foils = [c for c in df.columns if c not in meta]
+
+    arrays = {}
+    codes = np.empty((len(df), len(meta)), dtype=np.uint8)
+    for i, col in enumerate(meta):
+        col_codes, cats = pd.factorize(df[col])
+        if len(cats) > 255:
+            raise ValueError(f"{csv_path}: Spalte {col} hat mehr als 255 Werte")
+        codes[:, i] = col_codes
+        arrays[f"cat_{i}"] = np.asarray(cats, dtype=str)
+
+    ranks = df[foils].fillna(0).to_numpy()
+    if ranks.min(initial=0) < 0 or ranks.max(initial=0) > 255:
+        raise ValueError(f"{csv_path}: Ränge ausserhalb 0..255")
+
+    np.savez(
+        out_path,
+        columns=np.asarray(df.columns, dtype=str),
+        meta=np.asarray(meta, dtype=str),
+        foils=np.asarray(foils, dtype=str),
+        codes=codes,
+        ranks=ranks.astype(np.uint8),
+        source_version=np.asarray(file_version(csv_path), dtype=np.int64),
+        **arrays,
+    )
+    return out_path
+
+
+# =========================================================
+# LOADER
+# =========================================================
+def _memmap_member(path, zf, name):
+    """Array aus einem unkomprimierten .npz-Eintrag direkt per np.memmap öffnen"""
+    info = zf.getinfo(f"{name}.npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+
+    with open(path, "rb") as f:
+        f.seek(info.header_offset)
+        local = f.read(30)
+        name_len, extra_len = struct.unpack("<HH", local[26:30])
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+    if not shape or 0 in shape:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran else "C")
+
+
+def load_matrix(path, mmap=True):
+    """Kompilierte Matrix laden; codes/ranks als read-only memmap (mmap=False: im RAM)"""
+    with np.load(path, allow_pickle=False) as npz:
+        meta = [str(c) for c in npz["meta"]]
+        matrix = {
+            "columns": [str(c) for c in npz["columns"]],
+            "meta": meta,
+            "foils": [str(c) for c in npz["foils"]],
+            "categories": {col: npz[f"cat_{i}"] for i, col in enumerate(meta)},
+            "source_version": tuple(int(v) for v in npz["source_version"]),
+        }
+        if not mmap:
+            matrix["codes"] = npz["codes"]
+            matrix["ranks"] = npz["ranks"]
+
+    if mmap:
+        with zipfile.ZipFile(path) as zf:
+            for name in ["codes", "ranks"]:
+                matrix[name] = _memmap_member(path, zf, name)
+    return matrix
+
+
+def is_fresh(csv_path):
+    """True, wenn die .npz zur aktuellen CSV-Version passt"""
+    npz_path = compiled_path(csv_path)
+    if not os.path.exists(npz_path):
+        return False
+    with np.load(npz_path, allow_pickle=False) as npz:
+        return tuple(int(v) for v in npz["source_version"]) == file_version(csv_path)
+
+
+def to_dataframe(matrix):
+    """
+    DataFrame mit denselben Spalten wie die CSV (Ränge als uint8).
+    Kopiert die Arrays in den Prozess – für Werkzeuge / CLI; die Apps bauen
+    ihren Index über foilfinder_data.derived direkt aus der memmap.
+    """
+    import pandas as pd
+
+    data = {}
+    for i, col in enumerate(matrix["meta"]):
+        data[col] = matrix["categories"][col].astype(object)[matrix["codes"][:, i]]
+    for i, col in enumerate(matrix["foils"]):
+        data[col] = np.asarray(matrix["ranks"][:, i])
+    return pd.DataFrame(data, columns=matrix["columns"])
+
+
+# =========================================================
+# CLI
+# =========================================================
+if __name__ == "__main__":
+    for csv_path in sys.argv[1:] or MATRIX_FILES:
+        out = compile_csv(csv_path)
+        print(f"{csv_path} → {out} ({os.path.getsize(csv_path)} → {os.path.getsize(out)} Bytes)")
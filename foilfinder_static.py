@@ -0,0 +1,244 @@
+# foilfinder_static.py
+# Statischer Export des ganzen Empfehlungsraums für Kiosk / CDN / offline
+#
+# Die Eingaberäume sind endlich, deshalb wird jede Antwort einmal berechnet:
+#   foilfinder  recommend (CSV-Matrix) für alle Profile – per recommend_batch
+#   parawing    RULE_TABLE (recommend_top3 / recommend_top3_wingfoil), Slider-Reranking
+#               rechnet die Seite selbst (Eigenschaften × Gewichte, wie rerank_by_score)
+#   specs       FOIL_SPECS aus foil_catalog
+# Der kontinuierliche Modus (exakte kg / Knoten) wird nicht exportiert.
+#
+# Bundle (JSON, kompakt): Foil-Namen einmal als Liste, Antworten als Indizes;
+# Schlüssel = Profil-Code, pro Feld ein Zeichen = Index im Werte-Array ("-" = nicht relevant).
+# index.html enthält Bundle + JS inline und läuft ohne Server (auch per file://).
+#
+# Aufruf:  python foilfinder_static.py [--out export] [--check]
+#   --check  Bundle zurücklesen und jede Antwort gegen die Engines prüfen, Exit 1 bei Abweichung
+
+import argparse
+import gzip
+import itertools
+import json
+import os
+
+from foil_catalog import FOIL_RECORDS, normalize
+from foilfinder_data import column_values, load_table
+from foilfinder_engine import (
+    DISZIPLIN_LABELS,
+    KATEGORIE_IRRELEVANT,
+    KATEGORIE_LABELS,
+    META_COLS,
+    WIND_IRRELEVANT,
+    build_index,
+    input_options,
+    profile_key as foilfinder_key,
+    recommend,
+    recommend_batch,
+)
+from parawing_engine import (
+    CATEGORIES_PARAWING,
+    CATEGORIES_WINGFOIL,
+    DISCIPLINES,
+    FOIL_PROPERTIES,
+    LEVELS,
+    PERFORMANCE_PARAMS,
+    RULE_TABLE,
+    RULE_VERSION,
+    WAVES_DOWNWIND,
+    WEIGHT,
+    WIND,
+    get_foil_type,
+    lookup_top3,
+)
+from recommend_service import foilfinder_domain
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_FILE = os.path.join(HERE, "foilfinder_functional_fixed.csv")
+TEMPLATE = os.path.join(HERE, "foilfinder_static.html")
+BUNDLE_FORMAT = 1
+TOP_N = 3
+
+CODE_CHARS = "0123456789abcdefghijklmnopqrstuvwxyz"
+PARAWING_FIELDS = ["discipline", "level", "weight", "category", "wind", "waves"]
+PARAWING_VALUES = {
+    "discipline": DISCIPLINES,
+    "level": LEVELS,
+    "weight": WEIGHT,
+    "category": CATEGORIES_PARAWING,
+    "wind": WIND,
+    "waves": WAVES_DOWNWIND,
+}
+
+
+def profile_code(fields, values, key):
+    """Ein Zeichen pro Feld: Index im Werte-Array, "-" für None"""
+    return "".join("-" if v is None else CODE_CHARS[values[f].index(v)] for f, v in zip(fields, key))
+
+
+class FoilTable:
+    """Foil-Namen → Index im Bundle (jeder Name nur einmal gespeichert)"""
+
+    def __init__(self):
+        self.names = [foil.name for foil in FOIL_RECORDS]
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+    def __call__(self, name):
+        if name not in self.index:
+            self.index[name] = len(self.names)
+            self.names.append(name)
+        return self.index[name]
+
+
+# =========================================================
+# EXPORT
+# =========================================================
+def foilfinder_section(df, foil_index):
+    values = column_values(df, META_COLS)
+    profiles = foilfinder_domain(values)
+    result = recommend_batch(df, list(profiles.values()), top_n=TOP_N)
+    answers = {}
+    for key, row in zip(profiles, result.itertuples(index=False)):
+        row = row._asdict()
+        if row["Empf1"] is None:
+            continue
+        flat = []
+        for i in range(1, TOP_N + 1):
+            flat += [foil_index(row[f"Empf{i}"]), int(row[f"Empf{i}_Score"])]
+        answers[profile_code(META_COLS, values, key)] = flat
+
+    return {
+        "fields": META_COLS,
+        "values": values,
+        "options": input_options(values),
+        "wind_irrelevant": WIND_IRRELEVANT,
+        "kategorie_irrelevant": KATEGORIE_IRRELEVANT,
+        "labels": {"Disziplin": DISZIPLIN_LABELS, "Kategorie": KATEGORIE_LABELS},
+        "answers": answers,
+    }
+
+
+def parawing_section(foil_index):
+    answers = {
+        profile_code(PARAWING_FIELDS, PARAWING_VALUES, key): [foil_index(name) for name in foils]
+        for key, foils in RULE_TABLE.items()
+    }
+    return {
+        "fields": PARAWING_FIELDS,
+        "values": PARAWING_VALUES,
+        "categories": {"Parawing": CATEGORIES_PARAWING, "Wingfoil": CATEGORIES_WINGFOIL},
+        "params": PERFORMANCE_PARAMS,
+        "properties": {fam: [props[p] for p in PERFORMANCE_PARAMS] for fam, props in FOIL_PROPERTIES.items()},
+        "rule_version": RULE_VERSION,
+        "answers": answers,
+    }
+
+
+def build_bundle(df):
+    foil_index = FoilTable()
+    foilfinder = foilfinder_section(df, foil_index)
+    parawing = parawing_section(foil_index)
+    names = foil_index.names
+    return {
+        "format": BUNDLE_FORMAT,
+        "foils": names,
+        "families": [get_foil_type(name) for name in names],
+        "specs": {foil.name: foil.specs for foil in FOIL_RECORDS},
+        "aliases": {normalize(n): foil.name for foil in FOIL_RECORDS for n in (foil.name, foil.csv_name)},
+        "foilfinder": foilfinder,
+        "parawing": parawing,
+    }
+
+
+def dumps(bundle):
+    return json.dumps(bundle, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_export(bundle, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    data = dumps(bundle)
+    paths = {}
+
+    paths["bundle"] = os.path.join(out_dir, "foilfinder_bundle.json")
+    with open(paths["bundle"], "w", encoding="utf-8") as f:
+        f.write(data)
+
+    # Bundle inline, damit die Seite auch ohne Server (file://) läuft
+    with open(TEMPLATE, encoding="utf-8") as f:
+        html = f.read().replace("__BUNDLE__", data.replace("</", "<\\/"))
+    paths["html"] = os.path.join(out_dir, "index.html")
+    with open(paths["html"], "w", encoding="utf-8") as f:
+        f.write(html)
+    return paths, data
+
+
+# =========================================================
+# PRÜFUNG
+# =========================================================
+def decode(bundle, section, code):
+    answer = bundle[section]["answers"].get(code)
+    if answer is None:
+        return None
+    if section == "parawing":
+        return [bundle["foils"][i] for i in answer]
+    return [(bundle["foils"][answer[i]], answer[i + 1]) for i in range(0, len(answer), 2)]
+
+
+def verify(bundle, df):
+    """Abweichungen zwischen Bundle und Engines als Liste von (Bereich, Profil)"""
+    mismatches = []
+
+    ff = bundle["foilfinder"]
+    index = build_index(df)
+    expected_codes = set()
+    for combo in itertools.product(*(ff["values"][c] for c in META_COLS)):
+        user = dict(zip(META_COLS, combo))
+        result = recommend(index, user)
+        code = profile_code(META_COLS, ff["values"], foilfinder_key(user))
+        if result is None:
+            if code in ff["answers"]:
+                mismatches.append(("foilfinder", user))
+            continue
+        expected_codes.add(code)
+        foils, scores = result
+        if decode(bundle, "foilfinder", code) != list(zip(foils[:TOP_N], scores[:TOP_N])):
+            mismatches.append(("foilfinder", user))
+    mismatches += [("foilfinder", code) for code in set(ff["answers"]) - expected_codes]
+
+    pw = bundle["parawing"]
+    for key in RULE_TABLE:
+        code = profile_code(PARAWING_FIELDS, pw["values"], key)
+        if decode(bundle, "parawing", code) != [r["Foil"] for r in lookup_top3(*key)]:
+            mismatches.append(("parawing", key))
+    if len(pw["answers"]) != len(RULE_TABLE):
+        mismatches.append(("parawing", "Anzahl Profile"))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statischer Export aller Empfehlungen (Bundle + index.html)")
+    parser.add_argument("--out", default=os.path.join(HERE, "export"))
+    parser.add_argument("--check", action="store_true", help="Bundle gegen die Engines prüfen")
+    args = parser.parse_args()
+
+    df = load_table(DATA_FILE)
+    bundle = build_bundle(df)
+    paths, data = write_export(bundle, args.out)
+
+    raw = len(data.encode())
+    packed = len(gzip.compress(data.encode(), compresslevel=9))
+    print(f"Foilfinder: {len(bundle['foilfinder']['answers'])} Profile, "
+          f"Parawing: {len(bundle['parawing']['answers'])} Profile, {len(bundle['foils'])} Foils")
+    print(f"Bundle: {raw / 1024:.1f} KiB ({packed / 1024:.1f} KiB gzip) → {paths['bundle']}")
+    print(f"Seite:  {paths['html']}")
+
+    if args.check:
+        with open(paths["bundle"], encoding="utf-8") as f:
+            mismatches = verify(json.load(f), df)
+        for area, profile in mismatches[:20]:
+            print("❌", area, profile)
+        print(f"Abweichungen: {len(mismatches)}")
+        raise SystemExit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
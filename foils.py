@@ -1,23 +1,10 @@
 # foils.py
+# Nummern für die Eingabe (app.py / foil_input.py) – Namen wie in progress.csv.
+# Abgeleitet aus foil_catalog (Nummer = Foil-ID).
+
+from foil_catalog import FOIL_RECORDS
 
 FOILS = {
     0: "nicht relevant",
-    1: "Infinity Ace 540",
-    2: "Infinity Ace 690",
-    3: "Infinity Ace 840",
-    4: "Infinity Ace 990",
-    5: "Infinity Ace 1140",
-    6: "Infinity Ace 1390",
-    7: "Stride Ace 1360",
-    8: "Stride Ace 1740",
-    9: "Stride 2050",
-    10: "Pacer 950",
-    11: "Pacer 1250",
-    12: "Pacer 1550",
-    13: "Pacer 1850",
-    14: "Pacer 2200",
-    15: "Flow 720",
-    16: "Flow 900",
-    17: "Flow 1080",
-    18: "Flow 1260",
+    **{foil.id: foil.csv_name for foil in FOIL_RECORDS},
 }
@@ -0,0 +1,222 @@
+# import_benchmark.py
+# Kaltstart der Apps / Engines messen (python -X importtime, je ein frischer Prozess)
+#
+# Apps werden nicht ausgeführt (Streamlit-UI, Stores) – gemessen werden ihre
+# Top-Level-Imports, gelesen per ast aus dem Skript. Engines direkt als Modul.
+# Zusätzlich der Datenpfad der Apps (DATA_PATHS, z.B. foilfinder_app.TABLES): der
+# Top-Level-Code bis zu dieser Zuweisung läuft wirklich (auf der frischen .npz),
+# gemessen wird die Wandzeit – so fallen auch erst beim Laden geholte Module auf.
+#
+# Aufruf:  python import_benchmark.py [--runs 5] [--save] [--check] [--tolerance 0.25]
+#   --save   Ergebnis als Baseline nach import_baseline.json schreiben
+#   --check  gegen die Baseline vergleichen, Exit 1 bei Regression
+#            (langsamer als Baseline × (1 + tolerance) oder neues schweres Modul)
+#
+# Zeiten werden relativ zu einer Bezugsmessung verglichen (REFERENCE, ein nacktes
+# "import numpy", direkt vor jedem Lauf gemessen; Median der Quotienten): die Baseline
+# gilt so auch auf schnelleren / langsameren Rechnern. Absolute ms stehen nur zur
+# Information in Ausgabe und Baseline.
+#
+# Engines müssen headless bleiben: lädt eine Engine ein UI-Modul (streamlit),
+# ist das immer ein Fehler – auch ohne Baseline.
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(HERE, "import_baseline.json")
+
+APPS = ["parawing_app.py", "foilfinder_app.py", "app.py"]
+ENGINES = ["foil_catalog", "parawing_engine", "foilfinder_engine", "foilfinder_generate_matrix", "progress_store",
+           "recommend_service"]
+
+# Module, die nur auf CSV- / Plot-Pfaden geladen werden sollen
+HEAVY = ["pandas", "matplotlib", "pyarrow", "scipy"]
+
+# Module, die nur die Apps laden dürfen
+UI = ["streamlit"]
+
+# App → Variable, bis zu der der Top-Level-Code ausgeführt wird
+DATA_PATHS = {"foilfinder_app.py": "TABLES"}
+
+# Bezugsmessung – jede Engine / App lädt NumPy, der Quotient ist rechnerunabhängig
+REFERENCE = ["numpy"]
+
+
+def app_imports(script):
+    """Top-Level-Module, die ein App-Skript importiert"""
+    with open(os.path.join(HERE, script), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def app_data_path(script, name):
+    """Top-Level-Code eines App-Skripts bis zur Zuweisung von name – ohne Ausdrücke (st.*-Aufrufe)"""
+    with open(os.path.join(HERE, script), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    body = []
+    for node in tree.body:
+        if isinstance(node, ast.Expr):
+            continue
+        body.append(node)
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == name for t in node.targets):
+            return ast.unparse(ast.Module(body=body, type_ignores=[]))
+    raise ValueError(f"{script}: keine Zuweisung an {name}")
+
+
+def targets():
+    """(Name, Module, Code) – Code None = nur die Imports"""
+    for app in APPS:
+        yield app, app_imports(app), None
+    for app, name in DATA_PATHS.items():
+        yield f"{os.path.splitext(app)[0]}.{name}", app_imports(app), app_data_path(app, name)
+    for module in ENGINES:
+        yield module, [module], None
+
+
+def compile_matrices():
+    """Datenpfade messen den schnellen Weg – veraltete / fehlende .npz vorher kompilieren"""
+    from foilfinder_matrix import MATRIX_FILES, compile_csv, is_fresh
+
+    for csv_path in MATRIX_FILES:
+        path = os.path.join(HERE, csv_path)
+        if os.path.exists(path) and not is_fresh(path):
+            compile_csv(path)
+
+
+# =========================================================
+# MESSUNG
+# =========================================================
+def parse_importtime(stderr):
+    """{Modul: kumulative µs} für Top-Level-Imports, plus Menge aller geladenen Module"""
+    top, loaded = {}, set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        loaded.add(name.strip())
+        if not name.startswith("  "):  # Einrückung = verschachtelter Import
+            top[name.strip()] = int(cumulative)
+    return top, loaded
+
+
+def measure(modules, body=None):
+    """(Top-Level-Imports, geladene Module, Wandzeit von body in µs bzw. None)"""
+    code = "; ".join(f"import {m}" for m in modules) or "pass"
+    if body is not None:
+        code = f"import time as _t\n_start = _t.perf_counter()\n{body}\nprint(int((_t.perf_counter() - _start) * 1e6))"
+    env = dict(os.environ, PYTHONPATH=HERE + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=HERE, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Import fehlgeschlagen ({code}):\n{proc.stderr[-2000:]}")
+    top, loaded = parse_importtime(proc.stderr)
+    return top, loaded, None if body is None else int(proc.stdout.split()[-1])
+
+
+def benchmark(runs):
+    """(Bezugszeit in ms, {Ziel: Ergebnis})"""
+    # Interpreter-Start (site, encodings, ...) herausrechnen
+    startup = set(measure([])[0])
+    compile_matrices()
+
+    def total(modules, body=None):
+        top, loaded, elapsed = measure(modules, body)
+        top = {m: us for m, us in top.items() if m not in startup}
+        return sum(top.values()) if elapsed is None else elapsed, top, loaded
+
+    references, results = [], {}
+    for name, modules, body in targets():
+        totals, ratios = [], []
+        for _ in range(runs):
+            # Bezug direkt vor jedem Lauf: Lastschwankungen treffen beide gleich
+            reference = total(REFERENCE)[0]
+            us, top, loaded = total(modules, body)
+            references.append(reference)
+            totals.append(us)
+            ratios.append(us / reference)
+        heaviest = sorted(top.items(), key=lambda kv: kv[1], reverse=True)[:5]
+        results[name] = {
+            "imports": modules,
+            "relative": round(statistics.median(ratios), 2),
+            "median_ms": round(statistics.median(totals) / 1e3, 1),
+            "min_ms": round(min(totals) / 1e3, 1),
+            "heavy": sorted(h for h in HEAVY if h in loaded),
+            "ui": sorted(u for u in UI if u in loaded),
+            "top": {m: round(us / 1e3, 1) for m, us in heaviest},
+        }
+    return round(statistics.median(references) / 1e3, 1), results
+
+
+def headless_violations(results):
+    return [f"{name}: Engine lädt {', '.join(results[name]['ui'])}" for name in ENGINES if results[name]["ui"]]
+
+
+def regressions(results, baseline, tolerance):
+    problems = headless_violations(results)
+    for name, r in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if "relative" in base and r["relative"] > base["relative"] * (1 + tolerance):
+            problems.append(f"{name}: {r['relative']} × Bezug > Baseline {base['relative']} × Bezug")
+        new_heavy = set(r["heavy"]) - set(base["heavy"])
+        if new_heavy:
+            problems.append(f"{name}: lädt jetzt {', '.join(sorted(new_heavy))}")
+    return problems
+
+
+# =========================================================
+# CLI
+# =========================================================
+def main():
+    parser = argparse.ArgumentParser(description="Import-Zeit (Kaltstart) der Apps und Engines")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--save", action="store_true", help="als Baseline speichern")
+    parser.add_argument("--check", action="store_true", help="gegen Baseline prüfen")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    reference_ms, results = benchmark(args.runs)
+
+    print(f"Bezug: import {', '.join(REFERENCE)} = {reference_ms} ms")
+    print(f"{'Ziel':<28} {'× Bezug':>8} {'Median':>9} {'Min':>9}  schwere Module / grösste Imports")
+    for name, r in results.items():
+        heavy = ", ".join(r["heavy"]) or "–"
+        top = ", ".join(f"{m} {ms}" for m, ms in list(r["top"].items())[:3])
+        print(f"{name:<28} {r['relative']:>8.2f} {r['median_ms']:>6.1f} ms {r['min_ms']:>6.1f} ms  [{heavy}]  {top}")
+
+    if args.save:
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "reference": REFERENCE, "reference_ms": reference_ms,
+                       "results": results}, f, indent=2)
+        print(f"Baseline → {BASELINE_FILE}")
+
+    for p in headless_violations(results):
+        print("⚠️ ", p)
+
+    if args.check:
+        with open(BASELINE_FILE, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        problems = regressions(results, baseline, args.tolerance)
+        for p in problems:
+            print("❌", p)
+        print(f"Regressionen: {len(problems)}")
+        raise SystemExit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
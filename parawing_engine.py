@@ -0,0 +1,709 @@
+# parawing_engine.py
+# Regel-Logik für parawing_app.py (Parawing / Wingfoil Top 3) – ohne Streamlit
+#
+# Der Eingaberaum ist klein (Level × Gewicht × Kategorie × Wind/Wellen), deshalb
+# werden recommend_top3 / recommend_top3_wingfoil beim Import einmal über den
+# ganzen Raum ausgewertet (RULE_TABLE). Die App liest nur noch aus der Tabelle;
+# die Regel-Funktionen bleiben als Referenz (verify_rule_table).
+#
+# Reiner Rechenkern ohne UI-Imports: Batch-Jobs, parawing_golden.py, die Benchmarks
+# und ein Web-Service importieren nur dieses Modul. parawing_app.py ist nur die
+# Streamlit-Ansicht (Eingaben → profile_key → recommend_profile → Anzeige).
+
+import functools
+import hashlib
+import itertools
+import math
+
+import numpy as np
+
+from foil_catalog import (
+    FAMILIES,
+    FAMILY_PROPERTIES,
+    FOIL_FAMILY,
+    FOIL_NAMES,
+    PERFORMANCE_PARAMS,
+    family_sizes,
+    foil_id,
+    get_foil,
+)
+from foil_sizing import family_size_list, size_at_position, size_index, sizes_at_position, weight_steps
+
+# =========================================================
+# FOIL SIZES
+# =========================================================
+# Parawing foils (Größen aus foil_catalog)
+FLOW_SIZES = family_sizes("Flow Ace").tolist()
+STRIDE_ACE_SIZES = family_sizes("Stride Ace").tolist()
+INFINITY_PARAWING_SIZES = family_sizes("Infinity Ace").tolist()
+
+# Wingfoil foils
+PACER_SIZES = family_sizes("Pacer").tolist()
+INFINITY_WINGFOIL_SIZES = family_sizes("Infinity Ace").tolist()
+FLOW_WINGFOIL_SIZES = family_sizes("Flow Ace").tolist()
+
+# Baselines
+FLOW_STANDARD = 1080
+FLOW_STANDARD_INDEX = size_index("Flow Ace", FLOW_STANDARD)
+INFINITY_WINGFOIL_STANDARD = 990
+INFINITY_WINGFOIL_STANDARD_INDEX = size_index("Infinity Ace", INFINITY_WINGFOIL_STANDARD)
+STRIDE_ACE_STANDARD = 1740  # Discover ab 70 kg
+STRIDE_ACE_STANDARD_INDEX = size_index("Stride Ace", STRIDE_ACE_STANDARD)
+
+# Flow → Infinity Mapping (for Parawing)
+FLOW_TO_INFINITY = {
+    720: 840,
+    900: 990,
+    1080: 1140,
+    1260: 1390
+}
+
+# =========================================================
+# PARAMETERS
+# =========================================================
+DISCIPLINES = ["Parawing", "Wingfoil"]
+LEVELS = ["Discover", "Discover to Intermediate", "Intermediate to Expert", "Expert"]
+WEIGHT = ["<70", "70-90", ">90"]
+WEIGHT_BUCKET_STEPS = {"<70": -1, "70-90": 0, ">90": 1}  # Größenschritte je Bucket
+CATEGORIES_PARAWING = ["Freeride", "Downwind-Wave"]
+CATEGORIES_WINGFOIL = ["Freeride"]
+WIND = ["Light", "Medium", "Strong"]
+WAVES_DOWNWIND = ["Small Waves (<0.5m)", "Medium Waves (0.5-1m)", "Big Waves (>1m)"]
+
+# =========================================================
+# FOIL PROPERTIES (for scoring)
+# =========================================================
+# Reihenfolge wie im Katalog – "Stride Ace" vor "Stride" (get_foil_type)
+FOIL_PROPERTIES = {fam.name: dict(fam.properties) for fam in FAMILIES}
+
+# =========================================================
+# HELPERS
+# =========================================================
+def get_foil_type(foil_name):
+    """Extract foil type from full foil name (e.g., 'Flow Ace 1080' -> 'Flow Ace')"""
+    for foil_type in FOIL_PROPERTIES.keys():
+        if foil_type in foil_name:
+            return foil_type
+    return None
+
+def weight_position(weight):
+    """
+    Gewicht in Größenschritten relativ zu 70-90: Bucket (-1 / 0 / +1) oder exakte kg
+    (kontinuierlicher Modus, interpoliert wie foil_sizing.weight_steps)
+    """
+    if weight in WEIGHT_BUCKET_STEPS:
+        return WEIGHT_BUCKET_STEPS[weight]
+    return weight_steps(weight)
+
+def calculate_foil_score(foil_name, user_weights):
+    """Calculate score for a foil based on user preferences"""
+    foil_type = get_foil_type(foil_name)
+    if not foil_type or foil_type not in FOIL_PROPERTIES:
+        return 0
+
+    properties = FOIL_PROPERTIES[foil_type]
+    score = sum(user_weights[param] * properties[param] for param in PERFORMANCE_PARAMS)
+    return score
+
+def rerank_reference(foils, user_weights):
+    """Ursprüngliche Schleife – Referenz für rerank_by_score"""
+    # Check if user has customized preferences (any slider != 0)
+    default_weight = 0.0
+    has_custom_prefs = any(user_weights[param] != default_weight for param in PERFORMANCE_PARAMS)
+
+    if not has_custom_prefs:
+        # No custom preferences, return original ranking
+        return foils
+
+    # Calculate scores for all foils
+    scored_foils = []
+    for foil_dict in foils:
+        foil_name = foil_dict["Foil"]
+        score = calculate_foil_score(foil_name, user_weights)
+        scored_foils.append({
+            "Foil": foil_name,
+            "Score": score,
+            "Rank": foil_dict["Rank"]  # Keep original rank for reference
+        })
+
+    # Sort by score descending
+    scored_foils.sort(key=lambda x: x["Score"], reverse=True)
+
+    # Re-assign ranks
+    for i, foil in enumerate(scored_foils):
+        foil["Rank"] = i + 1
+
+    return scored_foils
+
+# =========================================================
+# PROPERTY MATRIX
+# =========================================================
+# Ganzer Katalog (foil_catalog) × PERFORMANCE_PARAMS, einmal beim Import gebaut.
+# Reranking = eine Matrix-Vektor-Multiplikation statt Substring-Suche pro Foil.
+def property_vector(foil_name):
+    """Eigenschaften in PERFORMANCE_PARAMS-Reihenfolge (Nullen, wenn Typ unbekannt)"""
+    foil_type = get_foil_type(foil_name)
+    if not foil_type:
+        return np.zeros(len(PERFORMANCE_PARAMS))
+    return np.array([FOIL_PROPERTIES[foil_type][p] for p in PERFORMANCE_PARAMS], dtype=float)
+
+CATALOG = FOIL_NAMES
+PROPERTY_MATRIX = FAMILY_PROPERTIES[FOIL_FAMILY[1:]]
+PROPERTY_MATRIX.flags.writeable = False
+
+def weight_vector(user_weights):
+    return np.array([user_weights[p] for p in PERFORMANCE_PARAMS], dtype=float)
+
+def property_rows(foil_names):
+    """Zeilen aus PROPERTY_MATRIX (Namen + Aliasse); unbekannte Namen werden live aufgelöst"""
+    rows = []
+    for name in foil_names:
+        fid = foil_id(name)
+        rows.append(property_vector(name) if fid is None else PROPERTY_MATRIX[fid - 1])
+    return np.array(rows).reshape(len(foil_names), len(PERFORMANCE_PARAMS))
+
+def ranked(foil_names, scores):
+    """Absteigend nach Score, bei Gleichstand ursprüngliche Reihenfolge (wie list.sort)"""
+    order = np.argsort(-scores, kind="stable")
+    return [
+        {"Foil": foil_names[i], "Score": float(scores[i]), "Rank": rank + 1}
+        for rank, i in enumerate(order)
+    ]
+
+def rerank_by_score(foils, user_weights):
+    """Re-rank foils based on user preference scores"""
+    weights = weight_vector(user_weights)
+    if not weights.any():
+        # No custom preferences, return original ranking
+        return foils
+
+    names = [foil["Foil"] for foil in foils]
+    return ranked(names, property_rows(names) @ weights)
+
+def rerank_catalog(user_weights, foil_names=None):
+    """Ganzen Katalog (oder foil_names) nach Präferenz-Score ranken"""
+    if foil_names is None:
+        return ranked(CATALOG, PROPERTY_MATRIX @ weight_vector(user_weights))
+    return ranked(list(foil_names), property_rows(foil_names) @ weight_vector(user_weights))
+
+# =========================================================
+# RECOMMENDATION LOGIC
+# =========================================================
+def calculate_flow_offset(level, weight, category, wind, waves):
+    # Weight (Bucket oder exakte kg)
+    offset = weight_position(weight)
+
+    # Level
+    if level == "Discover":
+        offset += 2
+    elif level == "Discover to Intermediate":
+        offset += 1
+    elif level == "Intermediate to Expert":
+        offset += 0
+    elif level == "Expert":
+        offset -= 1
+
+    # Category-specific conditions
+    if category == "Freeride":
+        # For Freeride: Only wind matters
+        if wind and wind == "Light":
+            offset += 1
+        elif wind and wind == "Strong":
+            offset -= 1
+    elif category == "Downwind-Wave":
+        # For Downwind-Wave: Only waves matter
+        if waves:
+            if "Small" in waves:
+                offset += 1
+            elif "Big" in waves:
+                offset -= 1
+            # Medium = 0 (neutral)
+
+    return offset
+
+def get_optimal_flow(level, weight, category, wind, waves, adjust=0.0):
+    """adjust: zusätzliche (gebrochene) Größenschritte aus dem kontinuierlichen Modus"""
+    offset = calculate_flow_offset(level, weight, category, wind, waves) + adjust
+    return size_at_position("Flow Ace", FLOW_STANDARD_INDEX + offset), offset
+
+def stride_ace_size(weight):
+    """Stride-Größe für Discover: 1740 ab 70 kg, darunter 1360 (interpoliert wie die Flow-Größe)"""
+    return size_at_position("Stride Ace", STRIDE_ACE_STANDARD_INDEX + weight_position(weight))
+
+def should_recommend_stride_ace(level, weight, category, wind, waves, flow_size):
+    """
+    Stride Ace only for Discover/Discover to Intermediate in gentle conditions:
+    - Freeride: Light wind only
+    - Downwind-Wave: Small waves only
+    - Only if Flow >= 1080 (generally larger foil needed)
+    """
+    if level not in ["Discover", "Discover to Intermediate"]:
+        return False
+
+    if flow_size < 1080:
+        return False
+
+    # Category-specific gentle conditions check
+    if category == "Freeride":
+        # Stride only for light wind in Freeride
+        return wind == "Light"
+    elif category == "Downwind-Wave":
+        # Stride only for small waves in Downwind-Wave
+        return waves and "Small" in waves
+
+    return False
+
+def recommend_top3(level, weight, category, wind, waves, adjust=0.0):
+    flow_size, offset = get_optimal_flow(level, weight, category, wind, waves, adjust)
+    # Nachbargröße auf der Seite der Zielfläche (Buckets: die kleinere, falls vorhanden)
+    flow_sizes = sizes_at_position("Flow Ace", FLOW_STANDARD_INDEX + offset)
+
+    top3 = []
+
+    # DISCOVER / DISCOVER TO INTERMEDIATE with Stride Ace preference
+    if should_recommend_stride_ace(level, weight, category, wind, waves, flow_size):
+
+        if level == "Discover":
+            # Discover: Heavier riders (70-90 or >90): Stride 1740 possible
+            stride_size = stride_ace_size(weight)
+            stride_index = size_index("Stride Ace", stride_size)
+            if stride_index > 0:
+                top3.append({"Foil": f"Stride Ace {stride_size}", "Rank": 1})
+                top3.append({"Foil": f"Stride Ace {STRIDE_ACE_SIZES[stride_index - 1]}", "Rank": 2})
+                top3.append({"Foil": f"Flow Ace {flow_size}", "Rank": 3})
+            # Discover: Lighter riders (<70): Stride 1740 omitted
+            else:
+                infinity_size = FLOW_TO_INFINITY.get(flow_size)
+                top3.append({"Foil": "Stride Ace 1360", "Rank": 1})
+                top3.append({"Foil": f"Flow Ace {flow_size}", "Rank": 2})
+                if infinity_size:
+                    top3.append({"Foil": f"Infinity Ace {infinity_size}", "Rank": 3})
+        else:
+            # Discover to Intermediate: Stride 1360 as base
+            infinity_size = FLOW_TO_INFINITY.get(flow_size)
+            top3.append({"Foil": "Stride Ace 1360", "Rank": 1})
+            top3.append({"Foil": f"Flow Ace {flow_size}", "Rank": 2})
+            if infinity_size:
+                top3.append({"Foil": f"Infinity Ace {infinity_size}", "Rank": 3})
+
+    # DISCOVER without Stride (stronger wind / bigger waves)
+    elif level == "Discover":
+        top3.append({"Foil": f"Flow Ace {flow_size}", "Rank": 1})
+
+        # Rank 2: Infinity Ace
+        infinity_size = FLOW_TO_INFINITY.get(flow_size)
+        if infinity_size:
+            top3.append({"Foil": f"Infinity Ace {infinity_size}", "Rank": 2})
+
+        # Rank 3: Flow neighbor size (alternative)
+        top3.append({"Foil": f"Flow Ace {flow_sizes[1]}", "Rank": 3})
+
+    # DISCOVER TO INTERMEDIATE without Stride (stronger wind / bigger waves)
+    elif level == "Discover to Intermediate":
+        top3.append({"Foil": f"Flow Ace {flow_size}", "Rank": 1})
+
+        # Rank 2: Infinity Ace
+        infinity_size = FLOW_TO_INFINITY.get(flow_size)
+        if infinity_size:
+            top3.append({"Foil": f"Infinity Ace {infinity_size}", "Rank": 2})
+
+        # Rank 3: Flow neighbor size (alternative)
+        top3.append({"Foil": f"Flow Ace {flow_sizes[1]}", "Rank": 3})
+
+    # INTERMEDIATE TO EXPERT / EXPERT: Flow → Infinity → Flow (andere Größe)
+    else:
+        top3.append({"Foil": f"Flow Ace {flow_size}", "Rank": 1})
+
+        # Rank 2: Infinity Ace
+        infinity_size = FLOW_TO_INFINITY.get(flow_size)
+        if infinity_size:
+            top3.append({"Foil": f"Infinity Ace {infinity_size}", "Rank": 2})
+
+        # Rank 3: Flow neighbor size (alternative)
+        top3.append({"Foil": f"Flow Ace {flow_sizes[1]}", "Rank": 3})
+
+    return top3
+
+# =========================================================
+# WINGFOIL RECOMMENDATION LOGIC
+# =========================================================
+def calculate_wingfoil_offset(level, weight, wind):
+    """Calculate size offset for Wingfoil based on level, weight, and wind."""
+    # Weight (Bucket oder exakte kg)
+    offset = weight_position(weight)
+
+    # Level
+    if level == "Discover":
+        offset += 2
+    elif level == "Discover to Intermediate":
+        offset += 1
+    elif level == "Intermediate to Expert":
+        offset += 0
+    elif level == "Expert":
+        offset -= 1
+
+    # Wind
+    if wind == "Light":
+        offset += 1
+    elif wind == "Strong":
+        offset -= 1
+
+    return offset
+
+def wingfoil_position(level, weight, wind, foil_type, adjust=0.0):
+    """(Familie, gebrochene Index-Position) für Wingfoil nach Foil-Typ (Pacer, Flow oder Infinity)"""
+    offset = calculate_wingfoil_offset(level, weight, wind) + adjust
+
+    if foil_type == "Pacer":
+        # Pacer baseline: 1250 (index 1) - allows 2200 for heavy riders in light wind
+        return "Pacer", 1 + offset
+    elif foil_type == "Flow":
+        # Flow baseline: 900 (index 1) - analog to Infinity 990
+        return "Flow Ace", 1 + offset
+    else:  # Infinity
+        # Infinity baseline: 990 (index 3) - analog to Flow 900
+        return "Infinity Ace", INFINITY_WINGFOIL_STANDARD_INDEX + offset
+
+def get_optimal_wingfoil_size(level, weight, wind, foil_type, adjust=0.0):
+    """Get optimal size for Wingfoil based on foil type (Pacer, Flow, or Infinity)."""
+    return size_at_position(*wingfoil_position(level, weight, wind, foil_type, adjust))
+
+def smaller_alternative(top3, infinity_sizes, infinity_position, flow_size):
+    """
+    Rank 3: smaller alternative (prefer Infinity). Liegt die kontinuierliche Zielfläche
+    über der gewählten Infinity, ist die grössere Nachbargröße die Alternative.
+    """
+    infinity_index = size_index("Infinity Ace", infinity_sizes[0])
+    if infinity_index > 0 or infinity_position > infinity_index:
+        top3.append({"Foil": f"Infinity Ace {infinity_sizes[1]}", "Rank": 3})
+    else:
+        flow_index = size_index("Flow Ace", flow_size)
+        if flow_index > 0:
+            top3.append({"Foil": f"Flow Ace {FLOW_WINGFOIL_SIZES[flow_index - 1]}", "Rank": 3})
+
+def recommend_top3_wingfoil(level, weight, wind, adjust=0.0):
+    """Recommend top 3 foils for Wingfoil Freeride."""
+    top3 = []
+
+    # Discover: Only Pacer foils
+    if level == "Discover":
+        # Rank 2/3: Neighbor Pacer sizes (Buckets: zuerst die grössere)
+        pacer_sizes = sizes_at_position(
+            *wingfoil_position(level, weight, wind, "Pacer", adjust), n=3, smaller_first=False
+        )
+        for rank, pacer_size in enumerate(pacer_sizes, start=1):
+            top3.append({"Foil": f"Pacer {pacer_size}", "Rank": rank})
+
+    # Discover to Intermediate: Pacer Rank 1, smaller Pacer Rank 2, Infinity Rank 3
+    elif level == "Discover to Intermediate":
+        pacer_sizes = sizes_at_position(*wingfoil_position(level, weight, wind, "Pacer", adjust))
+        infinity_size = get_optimal_wingfoil_size(level, weight, wind, "Infinity", adjust)
+
+        top3.append({"Foil": f"Pacer {pacer_sizes[0]}", "Rank": 1})
+
+        # Rank 2: smaller Pacer (kontinuierlich: Nachbar auf der Seite der Zielfläche)
+        top3.append({"Foil": f"Pacer {pacer_sizes[1]}", "Rank": 2})
+
+        # Rank 3: Infinity Ace
+        top3.append({"Foil": f"Infinity Ace {infinity_size}", "Rank": 3})
+
+    # Intermediate to Expert: Infinity Rank 1, Flow Rank 2, smaller alternative Rank 3 (NO Pacer)
+    elif level == "Intermediate to Expert":
+        flow_size = get_optimal_wingfoil_size(level, weight, wind, "Flow", adjust)
+        _, infinity_position = wingfoil_position(level, weight, wind, "Infinity", adjust)
+        infinity_sizes = sizes_at_position("Infinity Ace", infinity_position)
+
+        top3.append({"Foil": f"Infinity Ace {infinity_sizes[0]}", "Rank": 1})
+        top3.append({"Foil": f"Flow Ace {flow_size}", "Rank": 2})
+        smaller_alternative(top3, infinity_sizes, infinity_position, flow_size)
+
+    # Expert: Infinity Rank 1, Flow Rank 2, smaller alternative Rank 3 (NO Pacer)
+    else:  # Expert
+        flow_size = get_optimal_wingfoil_size(level, weight, wind, "Flow", adjust)
+        _, infinity_position = wingfoil_position(level, weight, wind, "Infinity", adjust)
+        infinity_sizes = sizes_at_position("Infinity Ace", infinity_position)
+
+        infinity_index = size_index("Infinity Ace", infinity_sizes[0])
+
+        # Special case: Light riders + Strong wind = prefer smaller Infinity progression
+        # (Infinity schon bei der kleinsten Größe – in den Buckets genau <70 + Strong)
+        if infinity_index == 0:
+            top3.append({"Foil": f"Infinity Ace {INFINITY_WINGFOIL_SIZES[0]}", "Rank": 1})
+            top3.append({"Foil": f"Infinity Ace {INFINITY_WINGFOIL_SIZES[1]}", "Rank": 2})
+            top3.append({"Foil": f"Flow Ace {flow_size}", "Rank": 3})
+        else:
+            top3.append({"Foil": f"Infinity Ace {infinity_sizes[0]}", "Rank": 1})
+            top3.append({"Foil": f"Flow Ace {flow_size}", "Rank": 2})
+            smaller_alternative(top3, infinity_sizes, infinity_position, flow_size)
+
+    return top3
+
+# =========================================================
+# COMPILED RULE TABLE
+# =========================================================
+def input_domain():
+    """Alle Eingaben, die das UI erzeugen kann: (discipline, level, weight, category, wind, waves)"""
+    for lvl, gw in itertools.product(LEVELS, WEIGHT):
+        for wind in WIND:
+            yield ("Parawing", lvl, gw, "Freeride", wind, None)
+        for waves in WAVES_DOWNWIND:
+            yield ("Parawing", lvl, gw, "Downwind-Wave", None, waves)
+        for wind in WIND:
+            yield ("Wingfoil", lvl, gw, "Freeride", wind, None)
+
+def evaluate_rules(discipline, level, weight, category, wind, waves):
+    """Live-Regeln (if/elif-Bäume)"""
+    if discipline == "Parawing":
+        return recommend_top3(level, weight, category, wind, waves)
+    return recommend_top3_wingfoil(level, weight, wind)
+
+def compile_rule_table():
+    """Profil → Tuple der Foil-Namen in Rang-Reihenfolge"""
+    return {
+        key: tuple(rec["Foil"] for rec in evaluate_rules(*key))
+        for key in input_domain()
+    }
+
+RULE_TABLE = compile_rule_table()
+
+def lookup_top3(discipline, level, weight, category, wind, waves):
+    """Top 3 aus RULE_TABLE (gleiches Format wie recommend_top3); ausserhalb des Raums live"""
+    foils = RULE_TABLE.get((discipline, level, weight, category, wind, waves))
+    if foils is None:
+        return evaluate_rules(discipline, level, weight, category, wind, waves)
+    return [{"Foil": f, "Rank": i + 1} for i, f in enumerate(foils)]
+
+def verify_rule_table(table=None):
+    """Profile, bei denen Tabelle und Live-Regeln abweichen (leer = ok)"""
+    table = RULE_TABLE if table is None else table
+    return [
+        key for key in input_domain()
+        if table.get(key) != tuple(rec["Foil"] for rec in evaluate_rules(*key))
+    ]
+
+# =========================================================
+# CONTINUOUS MODE (kg / Knoten statt Buckets)
+# =========================================================
+# Die Regeln bekommen die exakten kg statt eines Buckets: jeder Zweig (auch Stride Ace
+# und der Infinity-Sonderfall) hängt nur an interpolierten Größen (weight_position),
+# es gibt keine Bucket-Kante bei 70 / 90 kg. Wind in Knoten: Wind-Bucket für die
+# kategorischen Zweige, die Größe über adjust = Knoten-Offset minus Bucket-Offset.
+# Auch die Alternativen folgen der Zielfläche (foil_sizing.nearest_sizes): 69 kg und
+# 71 kg bekommen dieselben beiden nächsten Größen, nur in anderer Reihenfolge. Fallen durch Klemmen an den Katalog-Enden zwei Empfehlungen zusammen, wird mit
+# Nachbargrößen auf 3 verschiedene Foils aufgefüllt (backfill).
+# In den Bucket-Mitten (60/80/100 kg, 10/15/20 kn) identisch mit RULE_TABLE.
+WIND_BUCKET_STEPS = {"Light": 1, "Medium": 0, "Strong": -1}
+WIND_KNOTS = {"Light": 10.0, "Medium": 15.0, "Strong": 20.0}  # Bucket-Mitten
+KNOTS_PER_STEP = 5.0
+
+# Cache-Schlüssel: kg / Knoten auf diese Schritte gerundet – kg ab-, Knoten aufgerundet.
+# Die Schwellen liegen auf dem Raster (Größenwechsel bei 70 / 90 kg, Wind-Buckets 12.5 /
+# 17.5 kn) und gehören zur Seite, zu der gerundet wird: 69.9 kg bleibt unter 70.
+KG_QUANTUM = 0.5
+KNOTS_QUANTUM = 0.5
+
+def weight_bucket(kg):
+    """kg → Gewichts-Bucket der Regeln (<70 / 70-90 / >90)"""
+    if kg < 70:
+        return "<70"
+    if kg <= 90:
+        return "70-90"
+    return ">90"
+
+def wind_bucket(knots):
+    if knots <= 12.5:
+        return "Light"
+    if knots <= 17.5:
+        return "Medium"
+    return "Strong"
+
+def wind_steps(knots):
+    """Wind → Größenschritte (mehr Wind = kleiner), Medium = 0"""
+    return (WIND_KNOTS["Medium"] - float(knots)) / KNOTS_PER_STEP
+
+def quantize(value, quantum, up=False):
+    steps = float(value) / quantum
+    return (math.ceil(steps) if up else math.floor(steps)) * quantum
+
+def wind_relevant(discipline, category):
+    return discipline == "Wingfoil" or category == "Freeride"
+
+def backfill(foils, n=3):
+    """Auf n verschiedene Foils auffüllen: Nachbargrößen der Empfehlungen, kleinere zuerst"""
+    foils = list(dict.fromkeys(foils))
+    for name in list(foils):
+        foil = get_foil(name)
+        sizes = family_size_list(foil.family)
+        i = sizes.index(foil.size)
+        for j in (i - 1, i + 1):
+            if len(foils) >= n:
+                return tuple(foils)
+            neighbour = f"{foil.family.name} {sizes[j]}" if 0 <= j < len(sizes) else None
+            if neighbour and neighbour not in foils:
+                foils.append(neighbour)
+    return tuple(foils)
+
+@functools.lru_cache(maxsize=4096)
+def _continuous_top3(discipline, level, kg, category, wind, waves, knots):
+    adjust = 0.0
+    if knots is not None:
+        wind = wind_bucket(knots)
+        adjust = wind_steps(knots) - WIND_BUCKET_STEPS[wind]
+
+    if discipline == "Parawing":
+        top3 = recommend_top3(level, kg, category, wind, waves, adjust)
+    else:
+        top3 = recommend_top3_wingfoil(level, kg, wind, adjust)
+    return backfill(rec["Foil"] for rec in top3)
+
+def recommend_continuous(discipline, level, kg, category, wind=None, waves=None, knots=None):
+    """
+    Top 3 für ein exaktes Gewicht (kg) und optional Wind in Knoten.
+    knots ersetzt die Wind-Kategorie; ohne knots zählt wind wie bisher.
+    Memoisiert auf (kg, knots) gerundet auf KG_QUANTUM / KNOTS_QUANTUM.
+    """
+    if knots is not None and wind_relevant(discipline, category):
+        knots = quantize(knots, KNOTS_QUANTUM, up=True)
+    else:
+        knots = None
+    foils = _continuous_top3(discipline, level, quantize(kg, KG_QUANTUM), category, wind, waves, knots)
+    return [{"Foil": f, "Rank": i + 1} for i, f in enumerate(foils)]
+
+# =========================================================
+# PROFILE (Cache-Schlüssel + komplette Pipeline)
+# =========================================================
+def rule_version():
+    """Hash über RULE_TABLE und PROPERTY_MATRIX – ändert sich mit jeder Regel-/Katalogänderung"""
+    digest = hashlib.sha1()
+    for item in sorted(repr(item) for item in RULE_TABLE.items()):
+        digest.update(item.encode())
+    digest.update(PROPERTY_MATRIX.tobytes())
+    return digest.hexdigest()[:12]
+
+RULE_VERSION = rule_version()
+
+def profile_key(discipline, level, kg, category, wind, waves, user_weights, knots=None, continuous=False):
+    """
+    Normalisiertes Profil – nur was das Ergebnis beeinflusst:
+    Bucket statt kg (bzw. gerundete kg / Knoten im kontinuierlichen Modus),
+    Wind nur wo relevant, Slider-Gewichte in PERFORMANCE_PARAMS-Reihenfolge.
+    """
+    if not wind_relevant(discipline, category):
+        wind = knots = None
+    if continuous:
+        weight = quantize(kg, KG_QUANTUM)
+        if knots is not None:
+            wind, knots = None, quantize(knots, KNOTS_QUANTUM, up=True)
+    else:
+        weight, knots = weight_bucket(kg), None
+    weights = tuple(float(user_weights.get(p, 0.0)) for p in PERFORMANCE_PARAMS)
+    return (discipline, level, continuous, weight, category, wind, waves, knots, weights)
+
+def recommend_profile(key):
+    """Top 3 inkl. Reranking für einen profile_key"""
+    discipline, level, continuous, weight, category, wind, waves, knots, weights = key
+    if continuous:
+        top3 = recommend_continuous(discipline, level, weight, category, wind, waves, knots)
+    else:
+        top3 = lookup_top3(discipline, level, weight, category, wind, waves)
+    return rerank_by_score(top3, dict(zip(PERFORMANCE_PARAMS, weights)))
+
+def verify_continuous():
+    """Profile, bei denen der kontinuierliche Modus in den Bucket-Mitten von RULE_TABLE abweicht"""
+    bucket_kg = {"<70": 60, "70-90": 80, ">90": 100}
+    mismatches = []
+    for key in input_domain():
+        discipline, level, weight, category, wind, waves = key
+        for knots in [None, WIND_KNOTS.get(wind)]:
+            got = recommend_continuous(discipline, level, bucket_kg[weight], category, wind, waves, knots)
+            if got != lookup_top3(*key):
+                mismatches.append((key, knots))
+    return mismatches
+
+def continuous_profiles():
+    """(discipline, level, category, wind, waves, knots) ohne Gewicht – Wind als Kategorie oder in Knoten"""
+    for lvl in LEVELS:
+        for wind in WIND:
+            yield ("Parawing", lvl, "Freeride", wind, None, None)
+            yield ("Wingfoil", lvl, "Freeride", wind, None, None)
+        for waves in WAVES_DOWNWIND:
+            yield ("Parawing", lvl, "Downwind-Wave", None, waves, None)
+        for knots in range(6, 32):
+            yield ("Parawing", lvl, "Freeride", None, None, knots)
+            yield ("Wingfoil", lvl, "Freeride", None, None, knots)
+
+def verify_monotonic(kgs=np.arange(40.0, 130.5, 0.5)):
+    """
+    kg-Sweep im kontinuierlichen Modus: immer 3 verschiedene Foils, und mit mehr Gewicht
+    wird keine Familie kleiner (grösste empfohlene Größe je Familie, die in beiden Schritten vorkommt)
+    """
+    problems = []
+    for discipline, level, category, wind, waves, knots in continuous_profiles():
+        previous = None
+        for kg in kgs:
+            foils = [r["Foil"] for r in recommend_continuous(discipline, level, kg, category, wind, waves, knots)]
+            profile = (discipline, level, float(kg), category, wind, waves, knots)
+            if len(set(foils)) < 3:
+                problems.append((profile, foils))
+            largest = {}
+            for foil in map(get_foil, foils):
+                largest[foil.family.name] = max(largest.get(foil.family.name, 0), foil.size)
+            if previous is not None and any(largest[f] < previous[f] for f in largest.keys() & previous.keys()):
+                problems.append((profile, foils))
+            previous = largest
+    return problems
+
+def verify_thresholds(thresholds=(70, 90), delta=1.0, shared=2):
+    """
+    Profile, bei denen sich die Empfehlungen knapp unter und über einer Bucket-Grenze
+    in weniger als `shared` Foils überschneiden (69 kg und 71 kg teilen die nächsten Größen)
+    """
+    problems = []
+    for discipline, level, category, wind, waves, knots in continuous_profiles():
+        for threshold in thresholds:
+            below, above = (
+                {r["Foil"] for r in recommend_continuous(discipline, level, kg, category, wind, waves, knots)}
+                for kg in (threshold - delta, threshold + delta)
+            )
+            if len(below & above) < shared:
+                problems.append(((discipline, level, threshold, category, wind, waves, knots), below, above))
+    return problems
+
+def verify_rerank(steps=(0.0, 2.5, 5.0)):
+    """(Profil, Gewichte), bei denen rerank_by_score und rerank_reference abweichen"""
+    mismatches = []
+    for values in itertools.product(steps, repeat=len(PERFORMANCE_PARAMS)):
+        user_weights = dict(zip(PERFORMANCE_PARAMS, values))
+        for foils in [list(lookup_top3(*key)) for key in input_domain()] + [
+            [{"Foil": name, "Rank": i + 1} for i, name in enumerate(CATALOG)]
+        ]:
+            if rerank_by_score(foils, user_weights) != rerank_reference(foils, user_weights):
+                mismatches.append((foils[0]["Foil"], values))
+    return mismatches
+
+if __name__ == "__main__":
+    mismatches = verify_rule_table()
+    print(f"{len(RULE_TABLE)} Profile kompiliert, {len(mismatches)} Abweichungen")
+    for key in mismatches:
+        print("❌", key)
+
+    continuous_mismatches = verify_continuous()
+    print(f"Kontinuierlicher Modus (Bucket-Mitten): {len(continuous_mismatches)} Abweichungen")
+    for key in continuous_mismatches:
+        print("❌", key)
+    monotonic_problems = verify_monotonic()
+    print(f"Kontinuierlicher Modus (kg-Sweep 40-130): {len(monotonic_problems)} Sprünge / fehlende Foils")
+    for key in monotonic_problems[:20]:
+        print("❌", key)
+    threshold_problems = verify_thresholds()
+    print(f"Kontinuierlicher Modus (69/71 und 89/91 kg): {len(threshold_problems)} ohne gemeinsame Nachbargrößen")
+    for key in threshold_problems[:20]:
+        print("❌", key)
+    for kg, knots in itertools.product([66, 69, 71, 74], [13, 17]):
+        foils = [r["Foil"] for r in recommend_continuous("Parawing", "Intermediate to Expert", kg, "Freeride", knots=knots)]
+        print(f"  {kg} kg, {knots} kn: {foils}")
+
+    rerank_mismatches = verify_rerank()
+    print(f"Reranking ({len(CATALOG)} Foils im Katalog): {len(rerank_mismatches)} Abweichungen")
+    for key in rerank_mismatches[:20]:
+        print("❌", key)
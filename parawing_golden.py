@@ -0,0 +1,233 @@
+# parawing_golden.py
+# Golden-Output-Regressionstest für die Parawing-/Wingfoil-Regeln (ersetzt parawing_test*.py)
+#
+# Statt die Regeln nachzubauen, wird der komplette Eingaberaum der echten
+# Funktionen aus parawing_engine ausgewertet und mit den gespeicherten
+# Golden-Tabellen in golden/*.csv verglichen:
+#   1. Zeilen-Hash pro Schlüssel (blake2b über die Ergebnis-Spalten)
+#   2. nur Zeilen mit anderem Hash werden Zelle für Zelle verglichen
+#   3. Ausgabe: nur geänderte Zellen (plus neue / fehlende Zeilen)
+#
+# Aufruf:  python parawing_golden.py            prüfen, Exit 1 bei Abweichungen
+#          python parawing_golden.py --update   Golden-Tabellen neu schreiben (nach gewollter Regeländerung)
+#          python parawing_golden.py --table top3 [--table rerank ...]
+
+import argparse
+import csv
+import hashlib
+import itertools
+import os
+import time
+
+from parawing_engine import (
+    LEVELS,
+    PERFORMANCE_PARAMS,
+    WAVES_DOWNWIND,
+    WEIGHT,
+    WIND,
+    input_domain,
+    lookup_top3,
+    recommend_continuous,
+    recommend_top3,
+    recommend_top3_wingfoil,
+    rerank_by_score,
+)
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+RANK_COLS = ["Platz_1", "Platz_2", "Platz_3"]
+
+
+def cell(value):
+    return "" if value is None else str(value)
+
+
+def ranks(top3):
+    names = [rec["Foil"] for rec in top3]
+    return tuple(names + [""] * (len(RANK_COLS) - len(names)))
+
+
+# =========================================================
+# TABELLEN (Eingaberaum → Ergebnis)
+# =========================================================
+# Jede Tabelle: Generator von (key, values) – Spalten siehe TABLES, values = RANK_COLS
+def table_top3():
+    """recommend_top3 über alle Argument-Kombinationen (auch die, die das UI nicht sendet)"""
+    for lvl, gw, kat, wind, waves in itertools.product(
+        LEVELS, WEIGHT, ["Freeride", "Downwind-Wave"], [None] + WIND, [None] + WAVES_DOWNWIND
+    ):
+        yield tuple(map(cell, (lvl, gw, kat, wind, waves))), ranks(recommend_top3(lvl, gw, kat, wind, waves))
+
+
+def table_top3_wingfoil():
+    for lvl, gw, wind in itertools.product(LEVELS, WEIGHT, WIND):
+        yield (lvl, gw, wind), ranks(recommend_top3_wingfoil(lvl, gw, wind))
+
+
+def table_lookup():
+    """Vorkompilierte RULE_TABLE – so wie die App sie abfragt"""
+    for key in input_domain():
+        yield tuple(map(cell, key)), ranks(lookup_top3(*key))
+
+
+def table_continuous():
+    """Kontinuierlicher Modus: jedes kg 40..125, Wind als Kategorie bzw. in Knoten (auch je 1 kg um die Bucket-Grenzen)"""
+    profiles = []
+    for lvl in LEVELS:
+        for wind in WIND:
+            profiles.append(("Parawing", lvl, "Freeride", wind, None))
+            profiles.append(("Wingfoil", lvl, "Freeride", wind, None))
+        for waves in WAVES_DOWNWIND:
+            profiles.append(("Parawing", lvl, "Downwind-Wave", None, waves))
+
+    for disc, lvl, kat, wind, waves in profiles:
+        for kg in range(40, 126):
+            yield (
+                tuple(map(cell, (disc, lvl, kg, kat, wind, waves, None))),
+                ranks(recommend_continuous(disc, lvl, kg, kat, wind, waves)),
+            )
+
+    for disc, lvl in itertools.product(["Parawing", "Wingfoil"], LEVELS):
+        for kg, knots in itertools.product([55, 60, 69, 70, 71, 80, 89, 90, 91, 100, 110], range(6, 32, 2)):
+            yield (
+                tuple(map(cell, (disc, lvl, kg, "Freeride", None, None, knots))),
+                ranks(recommend_continuous(disc, lvl, kg, "Freeride", knots=knots)),
+            )
+
+
+def slider_settings():
+    """Alle Slider 0 (= keine Umsortierung), je ein Slider auf 5, alle gleich, zwei Mischungen"""
+    settings = [[0.0] * len(PERFORMANCE_PARAMS)]
+    for i in range(len(PERFORMANCE_PARAMS)):
+        row = [0.0] * len(PERFORMANCE_PARAMS)
+        row[i] = 5.0
+        settings.append(row)
+    settings.append([3.0] * len(PERFORMANCE_PARAMS))
+    settings.append([5.0, 0.0, 0.0, 5.0, 0.0, 5.0])
+    settings.append([0.0, 4.5, 5.0, 0.0, 5.0, 1.0])
+    return settings
+
+
+def table_rerank():
+    for key in input_domain():
+        base = lookup_top3(*key)
+        for weights in slider_settings():
+            user_weights = dict(zip(PERFORMANCE_PARAMS, weights))
+            yield (
+                tuple(map(cell, key)) + ("/".join(f"{w:g}" for w in weights),),
+                ranks(rerank_by_score(base, user_weights)),
+            )
+
+
+PROFILE_COLS = ["Disziplin", "Level", "Gewicht", "Kategorie", "Wind", "Wellen"]
+
+TABLES = {
+    "top3": (["Level", "Gewicht", "Kategorie", "Wind", "Wellen"], table_top3),
+    "top3_wingfoil": (["Level", "Gewicht", "Wind"], table_top3_wingfoil),
+    "lookup": (PROFILE_COLS, table_lookup),
+    "continuous": (["Disziplin", "Level", "kg", "Kategorie", "Wind", "Wellen", "Knoten"], table_continuous),
+    "rerank": (PROFILE_COLS + ["Slider"], table_rerank),
+}
+
+
+# =========================================================
+# GOLDEN-DATEIEN
+# =========================================================
+def golden_path(name):
+    return os.path.join(GOLDEN_DIR, f"parawing_{name}.csv")
+
+
+def generate(name):
+    """{key: values} – Reihenfolge = Eingaberaum"""
+    return dict(TABLES[name][1]())
+
+
+def write_golden(name, rows):
+    key_cols = TABLES[name][0]
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    tmp = golden_path(name) + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(key_cols + RANK_COLS)
+        for key, values in rows.items():
+            writer.writerow(key + values)
+    os.replace(tmp, golden_path(name))
+
+
+def read_golden(name):
+    n_keys = len(TABLES[name][0])
+    with open(golden_path(name), newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader)
+        return {tuple(row[:n_keys]): tuple(row[n_keys:]) for row in reader}
+
+
+# =========================================================
+# DIFF
+# =========================================================
+def row_hash(values):
+    return hashlib.blake2b("\x1f".join(values).encode(), digest_size=8).digest()
+
+
+def diff(golden, current):
+    """
+    Geänderte Zellen als (key, Spalte, golden, aktuell).
+    Neue / fehlende Zeilen erscheinen mit Spalte "<Zeile>".
+    """
+    golden_hashes = {k: row_hash(v) for k, v in golden.items()}
+    changes = []
+    for key, values in current.items():
+        h = golden_hashes.pop(key, None)
+        if h is None:
+            changes.append((key, "<Zeile>", "", "neu"))
+        elif h != row_hash(values):
+            old = golden[key]
+            changes += [
+                (key, col, a, b) for col, a, b in zip(RANK_COLS, old, values) if a != b
+            ]
+    changes += [(key, "<Zeile>", "vorhanden", "fehlt") for key in golden_hashes]
+    return changes
+
+
+def check(names):
+    total = 0
+    for name in names:
+        if not os.path.exists(golden_path(name)):
+            print(f"⚠️  {name}: keine Golden-Datei – erst mit --update anlegen")
+            total += 1
+            continue
+        current = generate(name)
+        changes = diff(read_golden(name), current)
+        total += len(changes)
+        status = "✅" if not changes else "❌"
+        print(f"{status} {name:<14} {len(current):>6} Zeilen, {len(changes)} geänderte Zellen")
+        key_cols = TABLES[name][0]
+        for key, col, old, new in changes[:50]:
+            where = ", ".join(f"{c}={v}" for c, v in zip(key_cols, key) if v != "")
+            print(f"     {where} | {col}: {old!r} → {new!r}")
+        if len(changes) > 50:
+            print(f"     ... {len(changes) - 50} weitere")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Golden-Output-Test der Parawing-Regeln")
+    parser.add_argument("--update", action="store_true", help="Golden-Tabellen neu schreiben")
+    parser.add_argument("--table", action="append", choices=list(TABLES), help="nur diese Tabelle(n)")
+    args = parser.parse_args()
+    names = args.table or list(TABLES)
+
+    start = time.perf_counter()
+    if args.update:
+        for name in names:
+            rows = generate(name)
+            write_golden(name, rows)
+            print(f"{name:<14} {len(rows):>6} Zeilen → {golden_path(name)}")
+        return
+
+    changes = check(names)
+    print(f"Geprüft in {(time.perf_counter() - start) * 1e3:.0f} ms")
+    raise SystemExit(1 if changes else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,433 @@
+# progress_store.py
+# Speicherung der Experteneingabe (progress.csv)
+#
+# Zwei Backends mit gleicher Schnittstelle (refresh / save / claim / next_open / done_count / df):
+# - ProgressStore        CSV + Append-Journal (ein Prozess, einfache Ablage)
+# - SqliteProgressStore  SQLite im WAL-Modus mit Zeilen-Leases (mehrere Experten parallel)
+# open_store() wählt das Backend über die Umgebungsvariable FOILFINDER_STORE.
+#
+# Journal-Backend: Statt bei jedem "Speichern & weiter" die ganze CSV neu zu schreiben, wird jede
+# Bewertung als eine Zeile an ein Journal angehängt (progress.csv.journal, JSON-Lines).
+# Alle COMPACT_EVERY Einträge wird das Journal in die CSV übernommen (kompaktiert).
+# Anhängen (geteilt) und Kompaktieren (exklusiv) laufen unter einem Datei-Lock
+# (progress.csv.lock), damit kein Anhängen in ein Journal geht, das gerade übernommen wird.
+#
+# Im Speicher: DataFrame + Bitmap der erledigten Zeilen (Zeile mit Rang 1),
+# damit "nächste offene Zeile" und Fortschritt ohne apply(row_done) auskommen.
+# Zeilen werden über ihre Position adressiert (RangeIndex wie von read_csv).
+# Pro Kontext (Level / Gewicht / Disziplin) hält ein Ringpuffer die zuletzt
+# bewerteten Zeilen für das Kontext-Panel in app.py, ein Counter die Top-1 Foils
+# für die Konsistenz-Prüfung (häufigste Top-1 im Kontext).
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from foilfinder_data import file_version
+
+COMPACT_EVERY = 25
+LEASE_SECONDS = 15 * 60
+
+CONTEXT_COLS = ["Level", "Gewicht", "Disziplin"]
+CONTEXT_SIZE = 4
+
+
+@contextmanager
+def file_lock(path, shared=False):
+    """Prozess-übergreifendes Lock auf path (POSIX: flock, Windows: msvcrt – dort immer exklusiv)"""
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gibt nach ~10 s auf – weiter warten
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class BaseProgressStore:
+    """DataFrame + Bitmap der erledigten Zeilen; Backends liefern Laden/Speichern"""
+
+    def _init_state(self, df):
+        for f in self.foil_names:
+            if f not in df.columns:
+                df[f] = np.nan
+        self.df = df
+
+        ranks = self.df[self.foil_names].to_numpy(dtype=float)
+        is_top1 = ranks == 1
+        self.done = is_top1.any(axis=1)
+        self.done_count = int(self.done.sum())
+        self.cursor = 0
+
+        # Top-1 Foil pro Zeile (erstes Foil mit Rang 1) + Ringpuffer pro Kontext
+        self.top1 = [self.foil_names[j] if d else None
+                     for j, d in zip(is_top1.argmax(axis=1), self.done)]
+        self.context_keys = list(zip(*(self.df[c] for c in CONTEXT_COLS)))
+        self.context = defaultdict(lambda: deque(maxlen=CONTEXT_SIZE))
+        self.top1_counts = defaultdict(Counter)
+        for idx in np.flatnonzero(self.done):
+            key = self.context_keys[idx]
+            self.context[key].append(int(idx))
+            self.top1_counts[key][self.top1[idx]] += 1
+
+    def _apply(self, idx, ranks):
+        self.df.loc[idx, self.foil_names] = np.nan
+        for f, r in ranks.items():
+            self.df.at[idx, f] = r
+
+        now_done = 1 in ranks.values()
+        if now_done != self.done[idx]:
+            self.done[idx] = now_done
+            self.done_count += 1 if now_done else -1
+            if not now_done:
+                self.cursor = min(self.cursor, idx)
+
+        key = self.context_keys[idx]
+        counts = self.top1_counts[key]
+        if self.top1[idx] is not None:
+            counts[self.top1[idx]] -= 1
+            if counts[self.top1[idx]] <= 0:
+                del counts[self.top1[idx]]
+        self.top1[idx] = next((f for f in self.foil_names if ranks.get(f) == 1), None)
+        if self.top1[idx] is not None:
+            counts[self.top1[idx]] += 1
+
+        recent = self.context[key]
+        if idx in recent:
+            recent.remove(idx)
+        if now_done:
+            recent.append(idx)
+
+    def last_context(self, idx):
+        """Letzte bewertete Situationen im Kontext von Zeile idx, neueste zuerst"""
+        return [
+            {
+                "Wind": self.df.at[i, "Wind"],
+                "Wellen": self.df.at[i, "Wellen"],
+                "Foil": self.top1[i],
+            }
+            for i in reversed(self.context[self.context_keys[idx]])
+        ]
+
+    def modal_top1(self, idx):
+        """Häufigste Top-1 im Kontext von Zeile idx (None, wenn noch nichts bewertet)"""
+        counts = self.top1_counts[self.context_keys[idx]]
+        return counts.most_common(1)[0][0] if counts else None
+
+    def inconsistency_report(self):
+        """
+        Alle bewerteten Zeilen, deren Top-1 von der häufigsten Top-1 ihres Kontexts abweicht.
+        Spalten: Meta-Spalten, Top1, Erwartet, Anteil (Anteil der erwarteten Top-1 im Kontext).
+        """
+        modal = {}
+        for key, counts in self.top1_counts.items():
+            if counts:
+                foil, n = counts.most_common(1)[0]
+                modal[key] = (foil, n / sum(counts.values()))
+
+        rows = np.flatnonzero(self.done)
+        expected = [modal[self.context_keys[i]] for i in rows]
+        report = self.df.loc[rows, [c for c in self.df.columns if c not in self.foil_names]].copy()
+        report["Top1"] = [self.top1[i] for i in rows]
+        report["Erwartet"] = [e[0] for e in expected]
+        report["Anteil"] = [round(e[1], 2) for e in expected]
+        return report[report["Top1"] != report["Erwartet"]]
+
+    def next_open(self):
+        """Index der ersten offenen Zeile oder None (Cursor läuft nur vorwärts)"""
+        n = len(self.done)
+        while self.cursor < n and self.done[self.cursor]:
+            self.cursor += 1
+        return self.cursor if self.cursor < n else None
+
+    def claim(self, expert):
+        """Nächste Situation für diesen Experten (ohne Leases: erste offene Zeile)"""
+        return self.next_open()
+
+    def release(self, expert):
+        pass
+
+    def export_csv(self, path=None):
+        """Aktuellen Stand im CSV-Schema schreiben (atomar via os.replace)"""
+        path = path or self.path
+        tmp = path + ".tmp"
+        self.df.to_csv(tmp, index=False)
+        os.replace(tmp, path)
+
+
+class ProgressStore(BaseProgressStore):
+    def __init__(self, path, foil_names):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.lock_path = path + ".lock"
+        self.foil_names = list(foil_names)
+        self.lock = threading.RLock()
+        self.load()
+
+    # -----------------------------------------------------
+    # Laden / Journal nachlesen
+    # -----------------------------------------------------
+    def load(self):
+        self._init_state(pd.read_csv(self.path))
+        self.version = file_version(self.path)
+        self.offset = 0
+        self.pending = 0
+        self.refresh()
+
+    def refresh(self):
+        """Neue Journal-Zeilen (auch von anderen Prozessen) übernehmen"""
+        with self.lock:
+            if not os.path.exists(self.path) or file_version(self.path) != self.version:
+                return self.load()  # CSV wurde kompaktiert
+
+            if not os.path.exists(self.journal_path):
+                return
+            if os.path.getsize(self.journal_path) < self.offset:
+                return self.load()  # Journal wurde rotiert
+
+            with open(self.journal_path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read()
+
+            # nur vollständige Zeilen übernehmen
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].splitlines():
+                if line.strip():
+                    entry = json.loads(line)
+                    self._apply(entry["row"], entry["ranks"])
+                    self.pending += 1
+            self.offset += end
+
+    # -----------------------------------------------------
+    # Schreiben
+    # -----------------------------------------------------
+    def save(self, idx, ranks, expert=None):
+        """ranks: {Foil-Name: Rang}; leer = nicht relevant. Ohne Leases immer True."""
+        line = json.dumps({"row": int(idx), "ranks": ranks}, ensure_ascii=False) + "\n"
+        with self.lock:
+            # eine Zeile pro write() im Append-Modus – parallele Schreiber überschreiben sich nicht;
+            # das geteilte Lock hält nur ein laufendes compact() fern
+            with file_lock(self.lock_path, shared=True):
+                with open(self.journal_path, "ab") as f:
+                    f.write(line.encode("utf-8"))
+            self.refresh()  # übernimmt die eigene Zeile und alles, was andere inzwischen angehängt haben
+            if self.pending >= COMPACT_EVERY:
+                self.compact()
+        return True
+
+    def compact(self):
+        """
+        Journal in die CSV übernehmen (atomar via os.replace). Läuft komplett unter dem
+        exklusiven Datei-Lock: kein anderer Prozess kann währenddessen anhängen.
+        """
+        with self.lock, file_lock(self.lock_path):
+            self.refresh()  # alles bis zum Ende des Journals (oder ein fremdes compact() übernehmen)
+            if not os.path.exists(self.journal_path):
+                return
+
+            self.export_csv()
+            os.remove(self.journal_path)
+
+            self.version = file_version(self.path)
+            self.offset = 0
+            self.pending = 0
+
+
+class SqliteProgressStore(BaseProgressStore):
+    """
+    progress.sqlite neben der CSV (WAL: Leser blockieren Schreiber nicht).
+    Tabelle situations: row, ranks (JSON), seq (globaler Zähler für refresh).
+    Tabelle leases: row → expert, expires – jeder Experte bekommt eine eigene Situation.
+    save() mit expert schreibt nur, solange die Lease nicht verloren ist (abgelaufen und
+    von einem anderen Experten übernommen oder die Zeile inzwischen gespeichert).
+    Beim ersten Start wird der Stand aus CSV (+ Journal) übernommen.
+    """
+
+    def __init__(self, path, foil_names, db_path=None):
+        self.path = path
+        self.db_path = db_path or os.path.splitext(path)[0] + ".sqlite"
+        self.foil_names = list(foil_names)
+        self.lock = threading.RLock()
+        self.claims = {}  # (expert, row) → seq der Zeile bei der Reservierung
+
+        self.db = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False,
+                                  isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS situations ("
+            "row INTEGER PRIMARY KEY, ranks TEXT, expert TEXT, seq INTEGER NOT NULL DEFAULT 0)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS leases ("
+            "row INTEGER PRIMARY KEY, expert TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS situations_seq ON situations(seq)")
+        self.load()
+
+    def load(self):
+        # Meta-Spalten (Level, Gewicht, ...) kommen weiterhin aus der CSV
+        df = ProgressStore(self.path, self.foil_names).df
+
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                if self.db.execute("SELECT COUNT(*) FROM situations").fetchone()[0] == 0:
+                    self.db.executemany(
+                        "INSERT INTO situations(row, ranks) VALUES (?, ?)",
+                        [(i, json.dumps(ranks, ensure_ascii=False))
+                         for i, ranks in enumerate(self._frame_ranks(df))],
+                    )
+                rows = self.db.execute("SELECT row, ranks, seq FROM situations").fetchall()
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+
+            # Stand aus der DB in einem Schritt übernehmen
+            col = {f: j for j, f in enumerate(self.foil_names)}
+            matrix = np.full((len(df), len(self.foil_names)), np.nan)
+            for idx, ranks, _ in rows:
+                for f, r in json.loads(ranks).items():
+                    matrix[idx, col[f]] = r
+            df[self.foil_names] = matrix
+            self._init_state(df)
+            self.seq = max((seq for _, _, seq in rows), default=0)
+
+    def _frame_ranks(self, df):
+        ranks = df[self.foil_names].to_numpy(dtype=float)
+        for row in ranks:
+            yield {f: int(r) for f, r in zip(self.foil_names, row) if not np.isnan(r)}
+
+    def refresh(self):
+        """Änderungen anderer Experten/Prozesse seit dem letzten Aufruf übernehmen"""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT row, ranks, seq FROM situations WHERE seq > ? ORDER BY seq", (self.seq,)
+            ).fetchall()
+            for idx, ranks, seq in rows:
+                self._apply(idx, json.loads(ranks))
+                self.seq = max(self.seq, seq)
+
+    def save(self, idx, ranks, expert=None):
+        """
+        ranks: {Foil-Name: Rang}; leer = nicht relevant. Gibt die Lease der Zeile frei.
+        Mit expert: False, wenn die Lease verloren ist (ein anderer Experte hält die Zeile
+        oder hat sie seit der Reservierung gespeichert) – dann wird nichts geschrieben.
+        """
+        idx = int(idx)
+        with self.lock:
+            seq = self.claims.get((expert, idx))  # None ohne claim(): nur fremde gültige Leases prüfen
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                saved = self.db.execute(
+                    "UPDATE situations SET ranks = ?, expert = ?, "
+                    "seq = (SELECT COALESCE(MAX(seq), 0) + 1 FROM situations) "
+                    "WHERE row = ? AND (? IS NULL OR ("
+                    "  NOT EXISTS (SELECT 1 FROM leases WHERE row = ? AND expert != ? AND expires >= ?)"
+                    "  AND (? IS NULL OR seq = ?)))",
+                    (json.dumps(ranks, ensure_ascii=False), expert, idx,
+                     expert, idx, expert, time.time(), seq, seq),
+                ).rowcount == 1
+                if saved:
+                    self.db.execute("DELETE FROM leases WHERE row = ?", (idx,))
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+            if saved:
+                self.claims.pop((expert, idx), None)
+            self.refresh()
+        return saved
+
+    def claim(self, expert, lease_seconds=LEASE_SECONDS):
+        """
+        Offene Situation für diesen Experten reservieren: bestehende Lease verlängern,
+        sonst die erste offene Zeile ohne gültige Lease. None, wenn nichts mehr frei ist.
+        """
+        self.refresh()
+        now = time.time()
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                self.db.execute("DELETE FROM leases WHERE expires < ?", (now,))
+                leased = {r for (r,) in self.db.execute("SELECT row FROM leases WHERE expert != ?", (expert,))}
+                own = self.db.execute("SELECT row FROM leases WHERE expert = ?", (expert,)).fetchone()
+
+                idx = None
+                if own is not None and not self.done[own[0]]:
+                    idx = own[0]
+                else:
+                    start = self.next_open()
+                    if start is not None:
+                        free = np.flatnonzero(~self.done[start:]) + start
+                        idx = next((int(i) for i in free if int(i) not in leased), None)
+
+                self.db.execute("DELETE FROM leases WHERE expert = ?", (expert,))
+                if idx is not None:
+                    self.db.execute("INSERT OR REPLACE INTO leases(row, expert, expires) VALUES (?, ?, ?)",
+                                    (idx, expert, now + lease_seconds))
+                    # Stand der Zeile bei der (ersten) Reservierung – save() erkennt daran fremde Speicherungen
+                    if (expert, idx) not in self.claims:
+                        seq = self.db.execute("SELECT seq FROM situations WHERE row = ?", (idx,)).fetchone()[0]
+                        self.claims[expert, idx] = seq
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+        return idx
+
+    def release(self, expert):
+        with self.lock:
+            for key in [k for k in self.claims if k[0] == expert]:
+                del self.claims[key]
+            self.db.execute("DELETE FROM leases WHERE expert = ?", (expert,))
+
+
+def open_store(path, foil_names, backend=None):
+    """backend: 'sqlite' (Standard) oder 'journal'; sonst aus FOILFINDER_STORE"""
+    backend = backend or os.environ.get("FOILFINDER_STORE", "sqlite")
+    if backend == "journal":
+        return ProgressStore(path, foil_names)
+    return SqliteProgressStore(path, foil_names)
+
+
+if __name__ == "__main__":
+    # python progress_store.py          → SQLite-Stand zurück nach progress.csv exportieren
+    # python progress_store.py report   → Konsistenz-Bericht nach progress_inconsistent.csv
+    import sys
+    from foils import FOILS
+
+    store = SqliteProgressStore("progress.csv", [v for k, v in FOILS.items() if k != 0])
+    if sys.argv[1:] == ["report"]:
+        report = store.inconsistency_report()
+        report.to_csv("progress_inconsistent.csv", index=False)
+        print(f"{len(report)} von {store.done_count} bewerteten Situationen weichen ab "
+              f"→ progress_inconsistent.csv")
+    else:
+        store.export_csv()
+        print(f"progress.csv exportiert ({store.done_count} / {len(store.df)} bewertet)")
@@ -0,0 +1,290 @@
+# recommend_benchmark.py
+# Benchmark-Suite für alle Empfehlungs-Hot-Paths
+#
+#   foilfinder.recommend        Index-Lookup pro Profil (alle CSV-Kombinationen)
+#   foilfinder.recommend_batch  alle Profile in einem Aufruf
+#   parawing.recommend_top3 / recommend_top3_wingfoil / lookup_top3 / rerank_by_score
+#   generator.vectorized / generator.loop
+#   service.answer              HTTP-Service-Kern (recommend_service) ohne HTTP, beide Engines
+#
+# Skalierung (--scales 1,10,100) – synthetisch, jeweils die Achse, die die Arbeit bestimmt:
+#   foilfinder  Foil-Spalten der CSV × n (Kopien mit Suffix " #k")
+#   rerank      Kandidatenliste = Katalog × n
+#   generator   Disziplinen × n (Zeilen × n)
+# Die Regel-Funktionen hängen nicht an der Katalog-Grösse und laufen nur mit ×1.
+#
+# Pro Fall: p50 / p99 Latenz pro Aufruf, Durchsatz (Aufrufe/s bzw. Zeilen/s)
+# und Peak-Speicher (tracemalloc, separater Durchlauf).
+#
+# Aufruf:  python recommend_benchmark.py [--scales 1,10,100] [--save] [--check] [--tolerance 0.3]
+#   --save   Ergebnis nach benchmark_baseline.json
+#   --check  p50 gegen Baseline, Exit 1 bei Regression
+#
+# Verglichen wird p50 relativ zu einer festen Bezugsarbeit (reference_call), gemessen
+# direkt vor jeder Runde – die Baseline gilt so auch auf anderen Rechnern. Pro Fall
+# ROUNDS Runden (Median). Verdächtige Fälle misst --check bis zu RETRIES Mal nach und
+# behält den besten Wert: Last von aussen macht nur langsamer, eine echte Regression bleibt.
+# Absolute µs stehen nur zur Information in Ausgabe und Baseline.
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import foilfinder_generate_matrix as generator
+import recommend_service as service
+from foilfinder_benchmark import all_users
+from foilfinder_data import load_csv
+from foilfinder_engine import META_COLS, build_index, foil_names, recommend, recommend_batch
+from parawing_engine import (
+    CATALOG,
+    PERFORMANCE_PARAMS,
+    input_domain,
+    lookup_top3,
+    recommend_top3,
+    recommend_top3_wingfoil,
+    rerank_by_score,
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(HERE, "benchmark_baseline.json")
+DATA_FILE = os.path.join(HERE, "foilfinder_functional_fixed.csv")
+
+# Mindestanzahl Messungen pro Fall (kleine Domänen werden wiederholt)
+MIN_SAMPLES = 2000
+ROUNDS = 3
+RETRIES = 2
+
+
+# =========================================================
+# MESSUNG
+# =========================================================
+def run_calls(fn, calls, min_samples=MIN_SAMPLES):
+    """Latenzen (ns) pro Aufruf; calls wird wiederholt, bis min_samples erreicht sind"""
+    repeat = max(1, -(-min_samples // len(calls)))
+    latencies = np.empty(repeat * len(calls), dtype=np.int64)
+    i = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for args in calls:
+            t0 = time.perf_counter_ns()
+            fn(*args)
+            latencies[i] = time.perf_counter_ns() - t0
+            i += 1
+    return latencies, time.perf_counter() - start
+
+
+def peak_memory(fn, calls):
+    """Peak (Bytes) über einen Durchlauf aller Aufrufe"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    for args in calls:
+        fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak - base
+
+
+REFERENCE_ARRAY = np.arange(256)
+
+
+def reference_call():
+    """Feste Bezugsarbeit wie in den Hot-Paths: kurze Python-Schleife + kleine NumPy-Operationen"""
+    total = 0
+    for i in range(64):
+        total += i * i
+    return total + int(np.argsort(-REFERENCE_ARRAY, kind="stable")[0])
+
+
+def reference_p50(repeat=3):
+    """p50 (µs) der Bezugsarbeit, Median über repeat Messungen"""
+    return float(np.median([np.percentile(run_calls(reference_call, [()])[0], 50) for _ in range(repeat)])) / 1e3
+
+
+def result(name, scale, fn, calls, units_per_call=1, min_samples=MIN_SAMPLES):
+    rounds = []
+    for _ in range(ROUNDS):
+        reference = reference_p50()
+        latencies, total = run_calls(fn, calls, min_samples)
+        p50 = float(np.percentile(latencies, 50)) / 1e3
+        rounds.append((p50 / reference, reference, p50, latencies, total))
+    relative, reference, p50, latencies, total = sorted(rounds, key=lambda r: r[0])[len(rounds) // 2]
+    return {
+        "case": name,
+        "scale": scale,
+        "calls": len(latencies),
+        "relative": round(relative, 3),
+        "reference_us": round(reference, 2),
+        "p50_us": round(p50, 2),
+        "p99_us": round(float(np.percentile(latencies, 99)) / 1e3, 2),
+        "throughput": round(len(latencies) * units_per_call / total, 1),
+        "peak_kib": round(peak_memory(fn, calls) / 1024, 1),
+    }
+
+
+# =========================================================
+# SYNTHETISCHE DATEN
+# =========================================================
+def widen(df, scale):
+    """CSV mit scale × so vielen Foil-Spalten (Kopien mit Suffix)"""
+    if scale == 1:
+        return df
+    foils = df[foil_names(df)]
+    return pd.concat([df] + [foils.add_suffix(f" #{k}") for k in range(1, scale)], axis=1)
+
+
+def weight_samples(n=32, seed=0):
+    """Slider-Einstellungen (0..5 in 0.5er-Schritten), nie alle 0"""
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, 11, size=(n, len(PERFORMANCE_PARAMS))) / 2
+    values[:, 0] = np.maximum(values[:, 0], 0.5)
+    return [dict(zip(PERFORMANCE_PARAMS, row.tolist())) for row in values]
+
+
+# =========================================================
+# FÄLLE
+# =========================================================
+def foilfinder_cases(scale):
+    df = widen(load_csv(DATA_FILE), scale)
+    users = list(all_users(df[META_COLS]))
+
+    start = time.perf_counter()
+    index = build_index(df)
+    build_ms = (time.perf_counter() - start) * 1e3
+
+    rec = result("foilfinder.recommend", scale, recommend, [(index, u) for u in users])
+    rec["index_build_ms"] = round(build_ms, 1)
+    yield rec
+
+    batch = result(
+        "foilfinder.recommend_batch", scale,
+        lambda: recommend_batch(df, users, index=index), [()],
+        units_per_call=len(users), min_samples=5,
+    )
+    yield batch
+
+
+def parawing_cases(scale):
+    domain = list(input_domain())
+    if scale == 1:
+        para = [(lvl, gw, kat, wind, waves) for d, lvl, gw, kat, wind, waves in domain if d == "Parawing"]
+        wing = [(lvl, gw, wind) for d, lvl, gw, kat, wind, waves in domain if d == "Wingfoil"]
+        yield result("parawing.recommend_top3", scale, recommend_top3, para)
+        yield result("parawing.recommend_top3_wingfoil", scale, recommend_top3_wingfoil, wing)
+        yield result("parawing.lookup_top3", scale, lookup_top3, domain)
+
+    candidates = [{"Foil": name, "Rank": i + 1} for i, name in enumerate(CATALOG * scale)]
+    calls = [(candidates, w) for w in weight_samples()]
+    yield result("parawing.rerank_by_score", scale, rerank_by_score, calls,
+                 units_per_call=len(candidates), min_samples=200)
+
+
+def generator_cases(scale):
+    disciplines = list(generator.DISCIPLINE_WEIGHTS) * scale
+    n_rows = len(disciplines) * len(generator.LEVELS) * len(generator.GEWICHT) \
+        * len(generator.KATEGORIE) * len(generator.WIND) * len(generator.WELLEN)
+
+    yield result("generator.vectorized", scale, generator.generate_vectorized, [(disciplines,)],
+                 units_per_call=n_rows, min_samples=5)
+    if scale == 1:
+        yield result("generator.loop", scale, lambda d: list(generator.iter_rows(d)), [(disciplines,)],
+                     units_per_call=n_rows, min_samples=3)
+
+
+def service_cases(scale):
+    """Antworten aus den vorkompilierten Tabellen (nur ×1 – die Tabellen hängen an der echten CSV)"""
+    if scale != 1:
+        return
+    service.warm()
+    calls = [(dict(json.loads(body)["profile"]),) for _, body in service.foilfinder_answers().values()]
+    bucket_kg = {"<70": 60, "70-90": 80, ">90": 100}
+    calls += [
+        ({"engine": "parawing", "discipline": d, "level": lvl, "kg": bucket_kg[gw], "category": kat,
+          "wind": wind, "waves": waves},)
+        for d, lvl, gw, kat, wind, waves in input_domain()
+    ]
+    yield result("service.answer", scale, service.answer, calls)
+
+
+def benchmark(scales):
+    for scale in scales:
+        for case in itertools.chain(foilfinder_cases(scale), parawing_cases(scale), generator_cases(scale),
+                                    service_cases(scale)):
+            yield case
+
+
+# =========================================================
+# BASELINE
+# =========================================================
+def regressions(results, baseline, tolerance):
+    """(Fall, Skala) → Meldung für jeden Fall über Baseline × (1 + tolerance)"""
+    base = {(r["case"], r["scale"]): r for r in baseline}
+    problems = {}
+    for r in results:
+        b = base.get((r["case"], r["scale"]))
+        if b and "relative" in b and r["relative"] > b["relative"] * (1 + tolerance):
+            problems[r["case"], r["scale"]] = \
+                f"{r['case']} ×{r['scale']}: p50 {r['relative']} × Bezug > Baseline {b['relative']} × Bezug"
+    return problems
+
+
+def confirm(results, baseline, tolerance):
+    """Verdächtige Skalen erneut messen, pro Fall den besten Wert behalten"""
+    best = {(r["case"], r["scale"]): r for r in results}
+    problems = regressions(results, baseline, tolerance)
+    for attempt in range(RETRIES):
+        if not problems:
+            break
+        print(f"… {len(problems)} verdächtige Fälle, Nachmessung {attempt + 1}/{RETRIES}")
+        for r in benchmark(sorted({scale for _, scale in problems})):
+            key = (r["case"], r["scale"])
+            if key in problems and r["relative"] < best[key]["relative"]:
+                best[key] = r
+        problems = regressions(list(best.values()), baseline, tolerance)
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Empfehlungs-Hot-Paths")
+    parser.add_argument("--scales", default="1,10,100")
+    parser.add_argument("--save", action="store_true", help="als Baseline speichern")
+    parser.add_argument("--check", action="store_true", help="gegen Baseline prüfen")
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(",")]
+    results = []
+    print(f"{'Fall':<34} {'Skala':>5} {'× Bezug':>9} {'p50 µs':>10} {'p99 µs':>10} {'Durchsatz/s':>14} {'Peak KiB':>10}")
+    for r in benchmark(scales):
+        results.append(r)
+        print(f"{r['case']:<34} {'×' + str(r['scale']):>5} {r['relative']:>9.2f} {r['p50_us']:>10.2f} "
+              f"{r['p99_us']:>10.2f} {r['throughput']:>14,.0f} {r['peak_kib']:>10.1f}")
+
+    if args.save:
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": sys.version.split()[0],
+                "numpy": np.__version__,
+                "results": results,
+            }, f, indent=2)
+        print(f"Baseline → {BASELINE_FILE}")
+
+    if args.check:
+        with open(BASELINE_FILE, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        problems = confirm(results, baseline, args.tolerance)
+        for p in problems.values():
+            print("❌", p)
+        print(f"Regressionen: {len(problems)}")
+        raise SystemExit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+# recommend_service.py
+# Headless Kern des HTTP-Services (foilfinder_api.py) – kein FastAPI-Import
+#
+# Jede Antwort kommt fertig als JSON-Bytes aus einer vorkompilierten Tabelle:
+#   foilfinder  ganzer CSV-Eingaberaum per recommend_batch, einmal pro CSV-Version
+#               (derived: neu gebaut, sobald sich die Datei ändert – nie pro Anfrage gelesen)
+#   parawing    RULE_TABLE / recommend_profile, kodiert pro profile_key im result_cache
+#   specs       pro Foil aus foil_catalog, beim Import kodiert
+# Zu jeder Antwort gehört ein ETag = Hash der Bytes (gleiche Antwort → gleiches ETag,
+# auch über CSV-/Regel-Änderungen hinweg).
+#
+# Fehler: ValueError / ArithmeticError = ungültige Eingabe (422, auch falsche Feld-Typen und
+# Batch-Einträge, die kein Objekt sind), KeyError = Profil / Foil unbekannt (404)
+
+import hashlib
+import itertools
+import json
+import math
+import os
+
+from foil_catalog import FOIL_RECORDS, get_foil
+from foilfinder_data import column_values, derived
+from foilfinder_engine import (
+    KATEGORIE_IRRELEVANT,
+    META_COLS,
+    WIND_IRRELEVANT,
+    profile_key as foilfinder_key,
+    recommend_batch,
+)
+from parawing_engine import (
+    CATEGORIES_PARAWING,
+    CATEGORIES_WINGFOIL,
+    DISCIPLINES,
+    LEVELS,
+    PERFORMANCE_PARAMS,
+    RULE_VERSION,
+    WAVES_DOWNWIND,
+    WIND,
+    profile_key as parawing_key,
+    recommend_profile,
+    wind_relevant,
+)
+from result_cache import get_cache
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_FILE = os.path.join(HERE, "foilfinder_functional_fixed.csv")
+ENGINES = ["foilfinder", "parawing"]
+TOP_N = 3
+
+# Slider-Gewichte (parawing) wie in parawing_app, Fahrergewicht grosszügiger als der kg-Slider
+MIN_WEIGHT, MAX_WEIGHT = 0.0, 5.0
+MIN_KG, MAX_KG = 20.0, 200.0
+MIN_KNOTS, MAX_KNOTS = 0.0, 60.0
+
+# Parawing-Antworten ausserhalb von RULE_TABLE (Slider, kontinuierlicher Modus)
+PARAWING = get_cache("api.parawing", maxsize=8192)
+
+
+def encode(obj):
+    """(ETag, JSON-Bytes)"""
+    body = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"', body
+
+
+# =========================================================
+# FOILFINDER (CSV)
+# =========================================================
+def foilfinder_domain(values):
+    """Alle Profile aus den CSV-Werten, je normalisiertem Schlüssel eines"""
+    profiles = {}
+    for combo in itertools.product(*(values[c] for c in META_COLS)):
+        user = dict(zip(META_COLS, combo))
+        profiles.setdefault(foilfinder_key(user), user)
+    return profiles
+
+
+def build_foilfinder_answers(df):
+    """profile_key → (ETag, JSON) für jedes Profil mit Basiszeilen"""
+    profiles = foilfinder_domain(column_values(df, META_COLS))
+    result = recommend_batch(df, list(profiles.values()), top_n=TOP_N)
+
+    answers = {}
+    for key, row in zip(profiles, result.itertuples(index=False)):
+        row = row._asdict()
+        if row["Empf1"] is None:
+            continue
+        top = [
+            {"Foil": row[f"Empf{i}"], "Score": int(row[f"Empf{i}_Score"]), "Rank": i}
+            for i in range(1, TOP_N + 1)
+        ]
+        answers[key] = encode({"engine": "foilfinder", "profile": dict(zip(META_COLS, key)), "top3": top})
+    return answers
+
+
+def foilfinder_answers():
+    return derived(DATA_FILE, build_foilfinder_answers)
+
+
+def required_fields(disziplin):
+    """Pflichtfelder wie profile_key: Kategorie / Wind nur, wo sie relevant sind"""
+    fields = ["Disziplin", "Level", "Gewicht", "Kategorie", "Wind", "Wellen"]
+    if disziplin in KATEGORIE_IRRELEVANT:
+        fields.remove("Kategorie")
+    if disziplin in WIND_IRRELEVANT:
+        fields.remove("Wind")
+    return fields
+
+
+def foilfinder_answer(params):
+    user = {c: params.get(c) for c in META_COLS}
+    missing = [c for c in required_fields(user["Disziplin"]) if user[c] is None]
+    if missing:
+        raise ValueError(f"Fehlende Felder: {', '.join(missing)}")
+    answer = foilfinder_answers().get(foilfinder_key(user))
+    if answer is None:
+        raise KeyError(f"Kein Profil in der Matrix: {foilfinder_key(user)}")
+    return answer
+
+
+# =========================================================
+# PARAWING (Regeln)
+# =========================================================
+def choice(params, name, options, default=None):
+    value = params.get(name, default)
+    if value not in options:
+        raise ValueError(f"{name}: {value!r} nicht in {options}")
+    return value
+
+
+def number(params, name, default=None):
+    value = params.get(name, default)
+    if value is None:
+        return None
+    try:
+        result = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name}: Zahl erwartet, nicht {value!r}") from None
+    if not math.isfinite(result):
+        raise ValueError(f"{name}: endliche Zahl erwartet, nicht {value!r}")
+    return result
+
+
+def flag(params, name):
+    value = params.get(name, False)
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "ja")
+    return bool(value)
+
+
+def slider_weights(value):
+    """Slider als Liste / "3,0,0,5,0,0" (PERFORMANCE_PARAMS-Reihenfolge) oder dict"""
+    if value is None or value == "":
+        return {}
+    if isinstance(value, dict):
+        unknown = set(value) - set(PERFORMANCE_PARAMS)
+        if unknown:
+            raise ValueError(f"weights: unbekannte Parameter {sorted(unknown)}")
+        weights = {p: number(value, p, 0.0) for p in PERFORMANCE_PARAMS}
+    else:
+        if isinstance(value, str):
+            value = value.split(",")
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(f"weights: Liste, \"3,0,0,5,0,0\" oder Objekt erwartet, nicht {value!r}")
+        if len(value) != len(PERFORMANCE_PARAMS):
+            raise ValueError(f"weights: {len(PERFORMANCE_PARAMS)} Werte erwartet ({', '.join(PERFORMANCE_PARAMS)})")
+        weights = {p: number({p: v}, p) for p, v in zip(PERFORMANCE_PARAMS, value)}
+    if any(not MIN_WEIGHT <= w <= MAX_WEIGHT for w in weights.values()):
+        raise ValueError(f"weights: Werte zwischen {MIN_WEIGHT:g} und {MAX_WEIGHT:g}")
+    return weights
+
+
+def parawing_profile(params):
+    """Eingaben prüfen → normalisierter parawing profile_key"""
+    discipline = choice(params, "discipline", DISCIPLINES)
+    level = choice(params, "level", LEVELS)
+    kg = number(params, "kg")
+    if kg is None or not MIN_KG <= kg <= MAX_KG:
+        raise ValueError(f"kg: Gewicht zwischen {MIN_KG:g} und {MAX_KG:g} erwartet")
+    categories = CATEGORIES_PARAWING if discipline == "Parawing" else CATEGORIES_WINGFOIL
+    category = choice(params, "category", categories, "Freeride")
+    continuous = flag(params, "continuous")
+    knots = number(params, "knots") if continuous else None
+    if knots is not None and not MIN_KNOTS <= knots <= MAX_KNOTS:
+        raise ValueError(f"knots: Wind zwischen {MIN_KNOTS:g} und {MAX_KNOTS:g} Knoten erwartet")
+
+    wind = waves = None
+    if wind_relevant(discipline, category):
+        if knots is None:
+            wind = choice(params, "wind", WIND)
+    else:
+        waves = choice(params, "waves", WAVES_DOWNWIND)
+
+    return parawing_key(
+        discipline, level, kg, category, wind, waves,
+        slider_weights(params.get("weights")), knots, continuous,
+    )
+
+
+def encode_parawing(key):
+    discipline, level, continuous, weight, category, wind, waves, knots, weights = key
+    profile = {
+        "discipline": discipline, "level": level, "continuous": continuous,
+        "weight": weight, "category": category, "wind": wind, "waves": waves,
+        "knots": knots, "weights": dict(zip(PERFORMANCE_PARAMS, weights)),
+    }
+    return encode({"engine": "parawing", "profile": profile, "top3": recommend_profile(key)})
+
+
+def parawing_answer(params):
+    key = parawing_profile(params)
+    return PARAWING.get(key, RULE_VERSION, lambda: encode_parawing(key))
+
+
+# =========================================================
+# EINSTIEG
+# =========================================================
+# Einzelwerte aus Query / JSON; nur weights darf Liste oder Objekt sein
+SCALARS = (str, int, float, bool, type(None))
+
+
+def check_fields(params):
+    """Profil muss ein Objekt mit Einzelwerten sein (z.B. nicht "Level": ["Expert"])"""
+    if not isinstance(params, dict):
+        raise ValueError(f"Profil: Objekt erwartet, nicht {type(params).__name__}")
+    for name, value in params.items():
+        if name != "weights" and not isinstance(value, SCALARS):
+            raise ValueError(f"{name}: Einzelwert erwartet, nicht {value!r}")
+
+
+def answer(params):
+    """(ETag, JSON) für ein Profil – params aus Query-Parametern oder JSON"""
+    check_fields(params)
+    engine = choice(params, "engine", ENGINES, "foilfinder")
+    if engine == "parawing":
+        return parawing_answer(params)
+    return foilfinder_answer(params)
+
+
+def error_body(status, detail):
+    return json.dumps({"status": status, "detail": detail}, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def batch_answer(profiles):
+    """
+    (ETag, JSON) für viele Profile: {"results": [...]} in Eingabe-Reihenfolge;
+    ungültige / unbekannte Profile als {"status": 422|404, "detail": ...}, jeder andere
+    Fehler als 500 – ein fehlerhaftes Profil bricht nie den ganzen Batch ab
+    """
+    parts = []
+    for params in profiles:
+        try:
+            parts.append(answer(params)[1])
+        except (ValueError, ArithmeticError) as e:
+            parts.append(error_body(422, str(e)))
+        except KeyError as e:
+            parts.append(error_body(404, e.args[0]))
+        except Exception as e:
+            parts.append(error_body(500, f"Interner Fehler ({type(e).__name__})"))
+    body = b'{"results":[' + b",".join(parts) + b"]}"
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"', body
+
+
+# =========================================================
+# SPECS
+# =========================================================
+SPECS = {
+    foil.id: encode({"Foil": foil.name, "Family": foil.family.name, "Size": foil.size, "Specs": foil.specs})
+    for foil in FOIL_RECORDS
+}
+
+
+def specs_answer(name):
+    foil = get_foil(name)
+    if foil is None:
+        raise KeyError(f"Foil nicht gefunden: {name}")
+    return SPECS[foil.id]
+
+
+def warm():
+    """Tabellen vor der ersten Anfrage bauen (Service-Start)"""
+    return len(foilfinder_answers())
+
+
+if __name__ == "__main__":
+    import time
+
+    start = time.perf_counter()
+    print(f"Foilfinder: {warm()} Profile vorkompiliert in {(time.perf_counter() - start) * 1e3:.0f} ms")
+    print(answer({"Disziplin": "Wingfoil", "Level": "Discovers", "Gewicht": "70-90 kg",
+                  "Kategorie": "Freeride", "Wind": "Medium Wind", "Wellen": "Flachwasser"})[1].decode())
+    print(answer({"engine": "parawing", "discipline": "Parawing", "level": "Expert", "kg": "80",
+                  "wind": "Light", "weights": "0,0,5,0,0,0"})[1].decode())
+    print(specs_answer("flow ace 1080")[1].decode())
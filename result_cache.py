@@ -0,0 +1,86 @@
+# result_cache.py
+# Prozessweiter LRU-Cache für Empfehlungs-Ergebnisse (alle Streamlit-Sessions teilen ihn)
+#
+# Schlüssel = normalisiertes Profil, dazu eine Daten-Version (CSV-Version bzw.
+# Hash der Regel-Tabelle). Ändert sich die Version, wird der Cache geleert.
+# Ergebnisse werden geteilt – NICHT verändern.
+
+import threading
+from collections import OrderedDict
+
+_REGISTRY = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+class ResultCache:
+    def __init__(self, name, maxsize=1024):
+        self.name = name
+        self.maxsize = maxsize
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version, compute):
+        """Wert zu key; bei Miss compute() ausführen und speichern"""
+        with self._lock:
+            if version != self.version:
+                if self._data:
+                    self.invalidations += 1
+                self._data.clear()
+                self.version = version
+            elif key in self._data:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return self._data[key]
+            self.misses += 1
+
+        # ausserhalb des Locks rechnen; doppelte Berechnung bei Gleichzeitigkeit ist harmlos
+        value = compute()
+
+        with self._lock:
+            if version == self.version:
+                self._data[key] = value
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "Cache": self.name,
+                "Einträge": len(self._data),
+                "Max": self.maxsize,
+                "Hits": self.hits,
+                "Misses": self.misses,
+                "Hit-Rate": round(self.hits / total, 3) if total else None,
+                "Evictions": self.evictions,
+                "Invalidierungen": self.invalidations,
+                "Version": str(self.version),
+            }
+
+
+def get_cache(name, maxsize=1024):
+    """Benannter Cache – einmal pro Prozess angelegt"""
+    with _REGISTRY_LOCK:
+        cache = _REGISTRY.get(name)
+        if cache is None:
+            cache = _REGISTRY[name] = ResultCache(name, maxsize)
+        return cache
+
+
+def cache_stats():
+    """Stats aller Caches (für die Debug-Ansicht)"""
+    with _REGISTRY_LOCK:
+        caches = list(_REGISTRY.values())
+    return [c.stats() for c in caches]